@@ -1,7 +1,9 @@
 """Install GeneFlow Workflow Engine."""
 import os
+import sqlite3
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 from setuptools.command.develop import develop
 from setuptools.command.install import install
 
@@ -13,12 +15,37 @@ INSTALL_REQUIRES = [
     pkg for pkg in open('requirements.txt').readlines()
 ]
 
-PYTHON_REQUIRES = '>=3.5.*'
+PYTHON_REQUIRES = '>=3.6'
+
+SQLITE_SQL_PATH = os.path.join('geneflow', 'data', 'sql', 'geneflow-sqlite.sql')
+SQLITE_DB_PATH = os.path.join('geneflow', 'data', 'sql', 'geneflow-sqlite.db')
+
+def build_sqlite_db(package_dir):
+    """Create the empty SQLite db that new session dbs are copied from."""
+    db_path = os.path.join(package_dir, SQLITE_DB_PATH)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    with open(os.path.join(package_dir, SQLITE_SQL_PATH), 'r') as sql_file:
+        query = sql_file.read()
+
+    dbh = sqlite3.connect(db_path)
+    try:
+        dbh.executescript('BEGIN;\n{}\nCOMMIT;'.format(query))
+    finally:
+        dbh.close()
+
+class PostBuildPyCommand(build_py):
+    """Post-build of python modules and package data."""
+    def run(self):
+        build_py.run(self)
+        build_sqlite_db(self.build_lib)
 
 class PostDevelopCommand(develop):
     """Post-installation for development mode."""
     def run(self):
         develop.run(self)
+        build_sqlite_db(os.path.join(BASE_DIR, 'src'))
 
 class PostInstallCommand(install):
     """Post-installation for installation mode."""
@@ -37,7 +64,6 @@ setup(
         'Intended Audience :: Developers',
         'Operating System :: POSIX :: BSD',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
@@ -64,6 +90,7 @@ setup(
                        'data/migrations/20180907-01.py',
                        'data/migrations/20200228-01.py',
                        'data/migrations/20200426-01.py',
+                       'data/migrations/20261016-01.py',
                        'data/templates/app.yaml.j2.j2',
                        'data/templates/agave-app-def.json.j2.j2',
                        'data/templates/wrapper-script.sh.j2',
@@ -73,6 +100,7 @@ setup(
     install_requires=INSTALL_REQUIRES,
     python_requires=PYTHON_REQUIRES,
     cmdclass={
+        'build_py': PostBuildPyCommand,
         'develop': PostDevelopCommand,
         'install': PostInstallCommand
         },
@@ -49,7 +49,11 @@ DATABASE_SCHEMA = {
             'host': {'type': 'string', 'required': True},
             'database': {'type': 'string', 'required': True},
             'user': {'type': 'string', 'required': True},
-            'password': {'type': 'string', 'required': True}
+            'password': {'type': 'string', 'required': True},
+            'pool_pre_ping': {'type': 'boolean', 'default': True},
+            'pool_size': {'type': 'integer', 'default': 10},
+            'max_overflow': {'type': 'integer', 'default': 20},
+            'pool_recycle': {'type': 'integer', 'default': 1800}
         }
     }
 }
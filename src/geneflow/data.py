@@ -5,25 +5,66 @@ This module contains SQLAlchemy classes for each GeneFlow table and the
 GeneFlow DataSource class.
 """
 
+from collections import deque
 import datetime
+import hashlib
 import json
 import os
 import uuid
 import yaml
 
-from sqlalchemy import create_engine, asc, desc, case
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from sqlalchemy import create_engine, asc, desc, case, func, or_
+from sqlalchemy import bindparam, delete, event, insert, select, update
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 from geneflow.definition import Definition
-from geneflow.log import Log
+from geneflow.log import LazyYaml, Log
 
 
 # global SQLAlchemy objects
 Base = declarative_base()
-Session = sessionmaker()
+
+
+def json_dumps(obj):
+    """
+    Serialize an object to a JSON string.
+
+    Uses the orjson package if installed, otherwise the json module.
+
+    Args:
+        obj: object to serialize.
+
+    Returns:
+        JSON string.
+
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    return json.dumps(obj)
+
+
+def _sqlite_on_connect(dbapi_connection, connection_record):
+    """
+    Disable the pysqlite driver's own transaction handling.
+
+    pysqlite doesn't emit BEGIN before SAVEPOINT, so releasing a savepoint
+    that starts a transaction commits it.
+    """
+    dbapi_connection.isolation_level = None
+
+
+def _sqlite_on_begin(conn):
+    """Emit BEGIN when SQLAlchemy starts a SQLite transaction."""
+    conn.exec_driver_sql('BEGIN')
 
 
 #### SQLAlchemy table definitions
@@ -46,6 +87,7 @@ class WorkflowEntity(Base):
     public = Column(Boolean, default=False)
     enable = Column(Boolean, default=True)
     test = Column(Boolean, default=False)
+    content_hash = Column(String, default='')
     created = Column(DateTime, default=datetime.datetime.now)
     modified = Column(DateTime, default=datetime.datetime.now)
 
@@ -131,6 +173,101 @@ class JobStepEntity(Base):
     msg = Column(String, default='')
 
 
+#### Pre-built SQL statements for frequently executed queries
+
+# status messages are appended to existing messages, separated by '|'
+UPDATE_JOB_STATUS = update(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id')).\
+    values(
+        status=bindparam('b_status'),
+        msg=case(
+            (JobEntity.msg == '', bindparam('b_msg', type_=String)),
+            else_=JobEntity.msg + '|' + bindparam('b_msg', type_=String)
+        )
+    )
+
+UPDATE_JOB_STEP_STATUS = update(JobStepEntity.__table__).\
+    where(JobStepEntity.step_id == bindparam('b_step_id')).\
+    where(JobStepEntity.job_id == bindparam('b_job_id')).\
+    values(
+        status=bindparam('b_status'),
+        detail=bindparam('b_detail'),
+        msg=case(
+            (JobStepEntity.msg == '', bindparam('b_msg', type_=String)),
+            else_=JobStepEntity.msg + '|' + bindparam('b_msg', type_=String)
+        )
+    )
+
+# job start/finish times are assigned by the database server, except for
+# sqlite, where CURRENT_TIMESTAMP is UTC rather than local time
+SET_JOB_STARTED = update(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id')).\
+    values(started=func.now())
+
+SET_JOB_STARTED_AT = update(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id')).\
+    values(started=bindparam('b_time'))
+
+SET_JOB_FINISHED = update(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id')).\
+    values(finished=func.now())
+
+SET_JOB_FINISHED_AT = update(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id')).\
+    values(finished=bindparam('b_time'))
+
+INSERT_WORKFLOW = insert(WorkflowEntity.__table__)
+
+DELETE_WORKFLOW_BY_ID = delete(WorkflowEntity.__table__).\
+    where(WorkflowEntity.id == bindparam('b_workflow_id'))
+
+INSERT_APP = insert(AppEntity.__table__)
+
+DELETE_APPS_BY_ID = delete(AppEntity.__table__).\
+    where(AppEntity.id.in_(bindparam('b_app_ids', expanding=True)))
+
+# use of a sub-query instead of join for delete is required for sqlite
+DELETE_DEPEND_BY_WORKFLOW_ID = delete(StepDependencyEntity.__table__).\
+    where(
+        StepDependencyEntity.child_id.in_(
+            select(StepEntity.id).\
+                where(StepEntity.workflow_id == bindparam('b_workflow_id'))
+        )
+    )
+
+# columns to update are taken from the execution parameters
+UPDATE_STEP = update(StepEntity.__table__).\
+    where(StepEntity.id == bindparam('b_step_id'))
+
+DELETE_STEP_BY_WORKFLOW_ID = delete(StepEntity.__table__).\
+    where(StepEntity.workflow_id == bindparam('b_workflow_id'))
+
+DELETE_JOB_BY_ID = delete(JobEntity.__table__).\
+    where(JobEntity.id == bindparam('b_job_id'))
+
+DELETE_JOB_BY_WORKFLOW_ID = delete(JobEntity.__table__).\
+    where(JobEntity.workflow_id == bindparam('b_workflow_id'))
+
+INSERT_JOB_STEP = insert(JobStepEntity.__table__)
+
+# use of a sub-query instead of join for delete is required for sqlite
+DELETE_JOB_STEP_BY_WORKFLOW_ID = delete(JobStepEntity.__table__).\
+    where(
+        JobStepEntity.job_id.in_(
+            select(JobEntity.id).\
+                where(JobEntity.workflow_id == bindparam('b_workflow_id'))
+        )
+    )
+
+# multi-table delete, for databases other than sqlite
+DELETE_JOB_STEP_BY_WORKFLOW_ID_JOIN = delete(JobStepEntity.__table__).\
+    where(JobStepEntity.job_id == JobEntity.id).\
+    where(JobEntity.workflow_id == bindparam('b_workflow_id'))
+
+DELETE_JOB_STEP_BY_JOB_ID = delete(JobStepEntity.__table__).\
+    where(JobStepEntity.job_id == bindparam('b_job_id'))
+
+
 #### Main GeneFlow database class
 
 
@@ -168,7 +305,11 @@ class DataSource:
                         db_conf['password'],
                         db_conf['host'],
                         db_conf['database']
-                    )
+                    ),
+                    pool_pre_ping=db_conf['pool_pre_ping'],
+                    pool_size=db_conf['pool_size'],
+                    max_overflow=db_conf['max_overflow'],
+                    pool_recycle=db_conf['pool_recycle']
                 )
             except SQLAlchemyError as err:
                 Log.an().error('sql exception [%s]', str(err))
@@ -183,11 +324,33 @@ class DataSource:
                 Log.an().error('sql exception [%s]', str(err))
                 raise DataSourceException('DataSource() init failed')
 
+            # let SQLAlchemy manage transactions so savepoints work
+            event.listen(self._engine, 'connect', _sqlite_on_connect)
+            event.listen(self._engine, 'begin', _sqlite_on_begin)
+
         else:
             Log.an().error('invalid db type: %s', db_conf['type'])
             raise DataSourceException('DataSource() init failed')
 
-        self._session = Session(bind=self._engine)
+        # each thread gets its own session from the registry
+        self._scoped_session = scoped_session(
+            sessionmaker(bind=self._engine)
+        )
+
+
+    @property
+    def _session(self):
+        """
+        Get the SQLAlchemy session for the current thread.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            Thread-local SQLAlchemy session.
+
+        """
+        return self._scoped_session()
 
 
     def commit(self):
@@ -202,7 +365,23 @@ class DataSource:
 
         """
         self._session.commit()
-        self._session.close()
+        self._scoped_session.remove()
+
+        return True
+
+
+    def close(self):
+        """
+        Close the session of the current thread without committing.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            True.
+
+        """
+        self._scoped_session.remove()
 
         return True
 
@@ -240,6 +419,24 @@ class DataSource:
         return result_dict
 
 
+    def _rows_as_dicts(self, stmt):
+        """
+        Execute a read-only Core statement and return rows as dicts.
+
+        Bypasses ORM entity hydration for queries whose results are only
+        converted to dicts.
+
+        Args:
+            self: class instance.
+            stmt: SQLAlchemy Core select statement.
+
+        Returns:
+            Dict array of results.
+
+        """
+        return [dict(row) for row in self._session.execute(stmt).mappings()]
+
+
     #### Methods for Normalized Definitions from DB ####
 
 
@@ -616,23 +813,29 @@ class DataSource:
         """
         workflow_id = str(uuid.uuid4()).replace('-', '')
         try:
-            self._session.add(WorkflowEntity(
-                id=workflow_id,
-                name=data['name'],
-                description=data['description'],
-                username=data['username'],
-                repo_uri=data['repo_uri'],
-                version=data['version'],
-                documentation_uri=data['documentation_uri'],
-                inputs=data['inputs'],
-                parameters=data['parameters'],
-                final_output=data['final_output'],
-                public=data['public'],
-                enable=data['enable'],
-                test=data['test'],
-                created=None,
-                modified=None
-            ))
+            # insert right away, so the workflow row goes out together with
+            # the bulk step and dependency inserts that follow
+            self._session.execute(
+                INSERT_WORKFLOW,
+                {
+                    'id': workflow_id,
+                    'name': data['name'],
+                    'description': data['description'],
+                    'username': data['username'],
+                    'repo_uri': data['repo_uri'],
+                    'version': data['version'],
+                    'documentation_uri': data['documentation_uri'],
+                    'inputs': data['inputs'],
+                    'parameters': data['parameters'],
+                    'final_output': data['final_output'],
+                    'public': data['public'],
+                    'enable': data['enable'],
+                    'test': data['test'],
+                    'content_hash': data.get('content_hash', ''),
+                    'created': None,
+                    'modified': None
+                }
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -692,9 +895,9 @@ class DataSource:
             return False
 
         try:
-            self._session.query(WorkflowEntity).\
-                filter(WorkflowEntity.id == workflow_id).\
-                delete(synchronize_session=False)
+            self._session.execute(
+                DELETE_WORKFLOW_BY_ID, {'b_workflow_id': workflow_id}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -806,6 +1009,48 @@ class DataSource:
         return result_dict
 
 
+    def get_app_map(self, app_ids, app_names):
+        """
+        Look up multiple apps by id or name with a single query.
+
+        Args:
+            app_ids: iterable of app ids.
+            app_names: iterable of app names.
+
+        Returns:
+            On success: dict with 'id' and 'name' keys, each mapping the
+                found app ids or names to app ids. Names map to the first
+                matching app.
+            On failure: False.
+
+        """
+        app_map = {'id': {}, 'name': {}}
+
+        app_filters = []
+        if app_ids:
+            app_filters.append(AppEntity.id.in_(app_ids))
+        if app_names:
+            app_filters.append(AppEntity.name.in_(app_names))
+
+        if not app_filters:
+            return app_map
+
+        try:
+            result = self._session.query(AppEntity.id, AppEntity.name).\
+                filter(or_(*app_filters)).\
+                all()
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        for row in result:
+            app_map['id'][row[0]] = row[0]
+            # use first match for names, same as lookup by name
+            app_map['name'].setdefault(row[1], row[0])
+
+        return app_map
+
+
     def add_app(self, data):
         """
         Add app record to database.
@@ -839,6 +1084,45 @@ class DataSource:
         return app_id
 
 
+    def add_apps(self, data_list):
+        """
+        Add multiple app records to database with a single bulk insert.
+
+        Args:
+            data_list: list of app record dicts.
+
+        Returns:
+            On success: list of IDs of new app records, in the same order as
+                data_list.
+            On failure: False.
+
+        """
+        if not data_list:
+            return []
+
+        app_rows = [
+            {
+                'id': str(uuid.uuid4()).replace('-', ''),
+                'name': data['name'],
+                'description': data['description'],
+                'repo_uri': data['repo_uri'],
+                'version': data['version'],
+                'username': data['username'],
+                'public': data['public'],
+                'definition': data['definition'],
+                'inputs': data['inputs'],
+                'parameters': data['parameters']
+            } for data in data_list
+        ]
+        try:
+            self._session.execute(INSERT_APP, app_rows)
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        return [row['id'] for row in app_rows]
+
+
     def update_app(self, app_id, data):
         """
         Update app record matching ID.
@@ -890,9 +1174,7 @@ class DataSource:
 
         # delete app
         try:
-            self._session.query(AppEntity).\
-                filter(AppEntity.id == app_id).\
-                delete(synchronize_session=False)
+            self._session.execute(DELETE_APPS_BY_ID, {'b_app_ids': [app_id]})
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -980,6 +1262,39 @@ class DataSource:
         return True
 
 
+    def add_depends(self, data_list):
+        """
+        Add multiple dependencies to current session with a single insert.
+
+        Args:
+            data_list: list of dictionaries with "child_id" and "parent_id"
+                as keys.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        if not data_list:
+            return True
+
+        try:
+            self._session.bulk_insert_mappings(
+                StepDependencyEntity,
+                [
+                    {
+                        'child_id': data['child_id'],
+                        'parent_id': data['parent_id']
+                    } for data in data_list
+                ]
+            )
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        return True
+
+
     def delete_depend_by_workflow_id(self, workflow_id):
         """
         Delete StepDependencyEntity in current session by workflow_id.
@@ -993,13 +1308,9 @@ class DataSource:
 
         """
         try:
-            # use of a sub-query instead of join for delete is required
-            # for sqlite
-            sub_query = self._session.query(StepEntity.id).\
-                filter(StepEntity.workflow_id == workflow_id)
-            self._session.query(StepDependencyEntity).\
-                filter(StepDependencyEntity.child_id.in_(sub_query)).\
-                delete(synchronize_session=False)
+            self._session.execute(
+                DELETE_DEPEND_BY_WORKFLOW_ID, {'b_workflow_id': workflow_id}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1098,6 +1409,43 @@ class DataSource:
         return step_id
 
 
+    def add_steps(self, data_list):
+        """
+        Add multiple steps to the current session with a single bulk insert.
+
+        Args:
+            data_list: list of dictionaries with the same keys as add_step.
+
+        Returns:
+            On success: list of IDs of new step records, in the same order as
+                data_list.
+            On failure: False.
+
+        """
+        step_rows = [
+            {
+                'id': str(uuid.uuid4()).replace('-', ''),
+                'workflow_id': data['workflow_id'],
+                'app_id': data['app_id'],
+                'name': data['name'],
+                'number': data['number'],
+                'letter': data['letter'],
+                'map_uri': data['map_uri'],
+                'map_regex': data['map_regex'],
+                'template': data['template'],
+                'exec_context': data['exec_context'],
+                'exec_method': data['exec_method']
+            } for data in data_list
+        ]
+        try:
+            self._session.bulk_insert_mappings(StepEntity, step_rows)
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        return [row['id'] for row in step_rows]
+
+
     def update_step(self, step_id, data):
         """
         Update a Step Entity object with a data dictionary.
@@ -1112,9 +1460,7 @@ class DataSource:
 
         """
         try:
-            self._session.query(StepEntity).\
-                filter(StepEntity.id == step_id).\
-                update(data)
+            self._session.execute(UPDATE_STEP, {'b_step_id': step_id, **data})
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1135,9 +1481,9 @@ class DataSource:
 
         """
         try:
-            self._session.query(StepEntity).\
-                filter(StepEntity.workflow_id == workflow_id).\
-                delete(synchronize_session=False)
+            self._session.execute(
+                DELETE_STEP_BY_WORKFLOW_ID, {'b_workflow_id': workflow_id}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1160,10 +1506,10 @@ class DataSource:
 
         """
         try:
-            result = self._session.query(JobEntity).\
-                filter(JobEntity.id == job_id).\
-                all()
-            result_dict = self.result_dict(result)
+            result_dict = self._rows_as_dicts(
+                select(JobEntity.__table__).\
+                    where(JobEntity.id == job_id)
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1171,6 +1517,30 @@ class DataSource:
         return result_dict
 
 
+    def iter_pending_jobs(self):
+        """
+        Stream pending jobs in current session.
+
+        Rows are fetched from the database in batches, so callers that only
+        consume the first few jobs don't materialize the whole queue.
+
+        Args:
+            None
+
+        Yields:
+            A dictionary for each pending job, ordered by queued time in
+            ascend order. SQLAlchemyError is raised to the caller on failure.
+
+        """
+        stmt = select(JobEntity.__table__).\
+            where(JobEntity.status == 'PENDING').\
+            order_by(asc(JobEntity.queued)).\
+            execution_options(yield_per=100)
+
+        for row in self._session.execute(stmt).mappings():
+            yield dict(row)
+
+
     def get_pending_jobs(self):
         """
         Find pending jobs in current session.
@@ -1185,11 +1555,7 @@ class DataSource:
 
         """
         try:
-            result = self._session.query(JobEntity).\
-                filter(JobEntity.status == 'PENDING').\
-                order_by(asc(JobEntity.queued)).\
-                all()
-            result_dict = self.result_dict(result)
+            result_dict = list(self.iter_pending_jobs())
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1210,45 +1576,25 @@ class DataSource:
             On failure: False.
 
         """
-        def merge_dicts(dict_a, dict_b):
-            """
-            Merge two dictionaries (for Python versions 3.4 or lower).
-
-            Args:
-                dict_a: First dictionary.
-                dict_b: Second dictionary.
-
-            Returns:
-                On success: return a new dict merging the two dicts.
-                On failure: False.
-
-            """
-            dict_c = dict_a.copy()
-            dict_c.update(dict_b)
-            return dict_c
-
         try:
-            query = self._session.query(
-                JobEntity, WorkflowEntity.name
-            )
+            query = select(
+                JobEntity.__table__,
+                WorkflowEntity.name.label('workflow_name')
+            ).\
+                join(
+                    WorkflowEntity.__table__,
+                    JobEntity.workflow_id == WorkflowEntity.id
+                )
 
             if username != '':
-                query = query.filter(JobEntity.username == username)
+                query = query.where(JobEntity.username == username)
 
             if status != '':
-                query = query.filter(JobEntity.status == status)
-
-            result = query.filter(JobEntity.workflow_id == WorkflowEntity.id).\
-                order_by(desc(JobEntity.status)).\
-                all()
+                query = query.where(JobEntity.status == status)
 
-            # convert result tuple to dict
-            result_dict = [
-                merge_dicts(
-                    row[0].__dict__,
-                    {'workflow_name': row[1]}
-                ) for row in result
-            ]
+            result_dict = self._rows_as_dicts(
+                query.order_by(desc(JobEntity.status))
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1309,18 +1655,10 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobEntity).\
-                filter(JobEntity.id == job_id).\
-                update(
-                    {
-                        'status': status,
-                        'msg': case(
-                            [(JobEntity.msg == '', msg)],
-                            else_=JobEntity.msg+'|'+msg
-                        )
-                    },
-                    synchronize_session=False
-                )
+            self._session.execute(
+                UPDATE_JOB_STATUS,
+                {'b_job_id': job_id, 'b_status': status, 'b_msg': msg}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1341,9 +1679,13 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobEntity).\
-                filter(JobEntity.id == job_id).\
-                update({'started': datetime.datetime.now()})
+            if self._engine.dialect.name == 'sqlite':
+                self._session.execute(
+                    SET_JOB_STARTED_AT,
+                    {'b_job_id': job_id, 'b_time': datetime.datetime.now()}
+                )
+            else:
+                self._session.execute(SET_JOB_STARTED, {'b_job_id': job_id})
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1364,9 +1706,13 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobEntity).\
-                filter(JobEntity.id == job_id).\
-                update({'finished': datetime.datetime.now()})
+            if self._engine.dialect.name == 'sqlite':
+                self._session.execute(
+                    SET_JOB_FINISHED_AT,
+                    {'b_job_id': job_id, 'b_time': datetime.datetime.now()}
+                )
+            else:
+                self._session.execute(SET_JOB_FINISHED, {'b_job_id': job_id})
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1387,9 +1733,7 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobEntity).\
-                filter(JobEntity.id == job_id).\
-                delete(synchronize_session=False)
+            self._session.execute(DELETE_JOB_BY_ID, {'b_job_id': job_id})
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1410,9 +1754,9 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobEntity).\
-                filter(JobEntity.workflow_id == workflow_id).\
-                delete(synchronize_session=False)
+            self._session.execute(
+                DELETE_JOB_BY_WORKFLOW_ID, {'b_workflow_id': workflow_id}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1436,22 +1780,16 @@ class DataSource:
 
         """
         try:
-            result = self._session.query(
-                StepDependencyEntity.parent_id,
-                JobStepEntity.status
-            ).\
-                filter(StepDependencyEntity.child_id == step_id).\
-                filter(StepDependencyEntity.parent_id == StepEntity.id).\
-                filter(StepEntity.id == JobStepEntity.step_id).\
-                filter(JobStepEntity.job_id == job_id).\
-                all()
-
-            result_dict = [
-                {
-                    'parent_id': row[0],
-                    'status': row[1]
-                } for row in result
-            ]
+            result_dict = self._rows_as_dicts(
+                select(
+                    StepDependencyEntity.parent_id,
+                    JobStepEntity.status
+                ).\
+                    where(StepDependencyEntity.child_id == step_id).\
+                    where(StepDependencyEntity.parent_id == StepEntity.id).\
+                    where(StepEntity.id == JobStepEntity.step_id).\
+                    where(JobStepEntity.job_id == job_id)
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1472,11 +1810,14 @@ class DataSource:
 
         """
         try:
-            self._session.add(JobStepEntity(
-                step_id=data['step_id'],
-                job_id=data['job_id'],
-                detail='{}',
-            ))
+            self._session.execute(
+                INSERT_JOB_STEP,
+                {
+                    'step_id': data['step_id'],
+                    'job_id': data['job_id'],
+                    'detail': '{}'
+                }
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1484,37 +1825,33 @@ class DataSource:
         return True
 
 
-    def update_job_step_status(self, step_id, job_id, status, detail, msg):
+    def add_job_steps(self, data_list):
         """
-        Update job step status in current session.
+        Add multiple job steps to the current session at once.
 
         Args:
-            step_id: step id string of the JobStepEntity.
-            job_id: job id string of the JobStepEntity.
-            status: status string of the JobStepEntity.
-            detail: string with detailed description.
-            msg: a string for message.
+            data_list: list of dictionaries with the following keys:
+                ['step_id', 'job_id'].
 
         Returns:
             On success: True.
             On failure: False.
 
         """
+        if not data_list:
+            return True
+
         try:
-            self._session.query(JobStepEntity).\
-                filter(JobStepEntity.step_id == step_id).\
-                filter(JobStepEntity.job_id == job_id).\
-                update(
+            self._session.execute(
+                INSERT_JOB_STEP,
+                [
                     {
-                        'status': status,
-                        'detail': detail,
-                        'msg': case(
-                            [(JobStepEntity.msg == '', msg)],
-                            else_=JobStepEntity.msg+'|'+msg
-                        )
-                    },
-                    synchronize_session=False
-                )
+                        'step_id': data['step_id'],
+                        'job_id': data['job_id'],
+                        'detail': '{}'
+                    } for data in data_list
+                ]
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1522,12 +1859,16 @@ class DataSource:
         return True
 
 
-    def delete_job_step_by_workflow_id(self, workflow_id):
+    def update_job_step_status(self, step_id, job_id, status, detail, msg):
         """
-        Delete JobStepEntity by workflow id.
+        Update job step status in current session.
 
         Args:
-            workflow_id: the id string of the JobStepEntity workflow.
+            step_id: step id string of the JobStepEntity.
+            job_id: job id string of the JobStepEntity.
+            status: status string of the JobStepEntity.
+            detail: string with detailed description.
+            msg: a string for message.
 
         Returns:
             On success: True.
@@ -1535,15 +1876,48 @@ class DataSource:
 
         """
         try:
-            # use of a sub-query instead of join for delete is required
-            # for sqlite
-            sub_query = self._session.query(JobEntity.id).\
-                filter(JobEntity.workflow_id == workflow_id)
-            self._session.query(JobStepEntity).\
-                filter(JobStepEntity.job_id.in_(sub_query)).\
-                delete(synchronize_session=False)
-        except SQLAlchemyError as err:
-            Log.an().error('sql exception [%s]', str(err))
+            self._session.execute(
+                UPDATE_JOB_STEP_STATUS,
+                {
+                    'b_step_id': step_id,
+                    'b_job_id': job_id,
+                    'b_status': status,
+                    'b_detail': detail,
+                    'b_msg': msg
+                }
+            )
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        return True
+
+
+    def delete_job_step_by_workflow_id(self, workflow_id):
+        """
+        Delete JobStepEntity by workflow id.
+
+        Args:
+            workflow_id: the id string of the JobStepEntity workflow.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        try:
+            if self._engine.dialect.name == 'sqlite':
+                self._session.execute(
+                    DELETE_JOB_STEP_BY_WORKFLOW_ID,
+                    {'b_workflow_id': workflow_id}
+                )
+            else:
+                self._session.execute(
+                    DELETE_JOB_STEP_BY_WORKFLOW_ID_JOIN,
+                    {'b_workflow_id': workflow_id}
+                )
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
             return False
 
         return True
@@ -1562,9 +1936,9 @@ class DataSource:
 
         """
         try:
-            self._session.query(JobStepEntity).\
-                filter(JobStepEntity.job_id == job_id).\
-                delete(synchronize_session=False)
+            self._session.execute(
+                DELETE_JOB_STEP_BY_JOB_ID, {'b_job_id': job_id}
+            )
         except SQLAlchemyError as err:
             Log.an().error('sql exception [%s]', str(err))
             return False
@@ -1618,6 +1992,31 @@ class DataSource:
 
     # Apps
 
+    @staticmethod
+    def _app_record(app_def):
+        """
+        Build an app table record from a validated app definition.
+
+        Args:
+            app_def: dict of validated app definition.
+
+        Returns:
+            Dict of app column values.
+
+        """
+        return {
+            'name'          : app_def['name'],
+            'description'   : app_def['description'],
+            'repo_uri'      : app_def['repo_uri'],
+            'version'       : app_def['version'],
+            'username'      : app_def['username'],
+            'public'        : app_def['public'],
+            'definition'    : json_dumps(app_def['definition']),
+            'inputs'        : json_dumps(app_def['inputs']),
+            'parameters'    : json_dumps(app_def['parameters'])
+        }
+
+
     def import_apps_from_dict(self, apps_dict, validate=True):
         """
         Import app definitions from a dict into DB.
@@ -1639,14 +2038,15 @@ class DataSource:
 
         """
         app_name2id = {}
+        app_list = []
 
-        for app in iter(apps_dict.values()):
+        for app in apps_dict.values():
 
             valid_def = {}
             if validate:
                 valid_def = Definition.validate_app(app)
                 if valid_def is False:
-                    Log.an().error('invalid app:\n%s', yaml.dump(app))
+                    Log.an().error('invalid app:\n%s', LazyYaml(app))
                     return False
 
             else:
@@ -1656,24 +2056,23 @@ class DataSource:
                 Log.an().error('duplicate app name: %s', valid_def['name'])
                 return False
 
-            app_id = self.add_app({
-                'name'          : valid_def['name'],
-                'description'   : valid_def['description'],
-                'repo_uri'      : valid_def['repo_uri'],
-                'version'       : valid_def['version'],
-                'username'      : valid_def['username'],
-                'public'        : valid_def['public'],
-                'definition'    : json.dumps(valid_def['definition']),
-                'inputs'        : json.dumps(valid_def['inputs']),
-                'parameters'    : json.dumps(valid_def['parameters'])
-            })
-            if not app_id:
-                Log.an().error(
-                    'cannot add app "%s" to data source', app['name']
-                )
-                return False
+            app_name2id[valid_def['name']] = None
+            app_list.append(self._app_record(valid_def))
 
-            app_name2id[valid_def['name']] = app_id
+        if not app_list:
+            return app_name2id
+
+        # insert all app records at once
+        app_ids = self.add_apps(app_list)
+        if not app_ids:
+            Log.an().error(
+                'cannot add apps to data source: %s',
+                ', '.join(app_name2id.keys())
+            )
+            return False
+
+        for app, app_id in zip(app_list, app_ids):
+            app_name2id[app['name']] = app_id
 
         return app_name2id
 
@@ -1719,23 +2118,63 @@ class DataSource:
             Log.an().error('invalid geneflow definition')
             return False
 
-        # delete by id or name
-        for app in iter(gf_def.apps().values()):
-            if app['app_id']:
-                if not self.delete_app_by_id(app['id']):
-                    Log.an().error(
-                        'cannot delete app from data source: app_id=%s',
-                        app['id']
-                    )
-                    return False
+        # partition apps into those identified by id and those by name
+        app_ids = [
+            app['app_id'] for app in gf_def.apps().values() if app['app_id']
+        ]
+        app_names = [
+            app['name'] for app in gf_def.apps().values() if not app['app_id']
+        ]
 
-            else: # use app name
-                if not self.delete_app_by_name(app['name']):
+        try:
+            # resolve names to ids, names must match exactly one app
+            if app_names:
+                result = self._session.query(AppEntity.id, AppEntity.name).\
+                    filter(AppEntity.name.in_(app_names)).\
+                    all()
+
+                name_ids = {}
+                for row in result:
+                    name_ids.setdefault(row[1], []).append(row[0])
+
+                for name in app_names:
+                    if name not in name_ids:
+                        Log.an().error('app "%s" not found', name)
+                        return False
+
+                    if len(name_ids[name]) > 1:
+                        Log.an().error(
+                            'non-unique app "%s", try deleting by id instead',
+                            name
+                        )
+                        return False
+
+                    app_ids.append(name_ids[name][0])
+
+            if not app_ids:
+                return True
+
+            # make sure apps are not linked to any steps
+            result = self._session.query(StepEntity.app_id).\
+                filter(StepEntity.app_id.in_(app_ids)).\
+                distinct().\
+                all()
+            if result:
+                for row in result:
                     Log.an().error(
-                        'cannot delete app from data source: app_name=%s',
-                        app['name']
+                        'app with id "%s" still used by steps', row[0]
                     )
-                    return False
+                return False
+
+            # delete all apps at once
+            self._session.execute(DELETE_APPS_BY_ID, {'b_app_ids': app_ids})
+
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            Log.an().error(
+                'cannot delete apps from data source: %s', def_path
+            )
+            return False
 
         return True
 
@@ -1758,7 +2197,7 @@ class DataSource:
         if validate:
             valid_def = Definition.validate_app(app_dict)
             if valid_def is False:
-                Log.an().error('invalid app:\n%s', yaml.dump(app_dict))
+                Log.an().error('invalid app:\n%s', LazyYaml(app_dict))
                 return False
 
         else:
@@ -1777,9 +2216,9 @@ class DataSource:
                     'version'       : valid_def['version'],
                     'username'      : valid_def['username'],
                     'public'        : valid_def['public'],
-                    'definition'    : json.dumps(valid_def['definition']),
-                    'inputs'        : json.dumps(valid_def['inputs']),
-                    'parameters'    : json.dumps(valid_def['parameters'])
+                    'definition'    : json_dumps(valid_def['definition']),
+                    'inputs'        : json_dumps(valid_def['inputs']),
+                    'parameters'    : json_dumps(valid_def['parameters'])
                 }
         ):
             Log.an().error(
@@ -1810,18 +2249,19 @@ class DataSource:
             Log.an().error('invalid geneflow definition')
             return False
 
-        if not gf_def.apps():
+        apps = gf_def.apps()
+        if not apps:
             Log.an().error('no apps in geneflow definition')
             return False
 
+        # can only update one at a time, so take first in list
+        app = next(iter(apps.values()))
+
         # insert app_id into first definition if provided
         if app_id:
-            next(iter(gf_def.apps().values()))['app_id'] = app_id
+            app['app_id'] = app_id
 
-        # can only update one at a time, so take first in list
-        return self.update_app_from_dict(
-            next(iter(gf_def.apps().values())), validate=False
-        )
+        return self.update_app_from_dict(app, validate=False)
 
 
     # Workflows
@@ -1840,39 +2280,83 @@ class DataSource:
             On failure: False.
 
         """
-        app_dict = {}
         steps = workflow_dict['steps']
-        for step in steps.values():
-            if step.get('app'):
-
-                app_id = app_dict.get(step['app'])
-                if not app_id:
-                    # app not yet loaded
 
-                    # import app definition
-                    if not os.path.isabs(step['app']):
-                        app_path = os.path.join(base_path, step['app'])
-                    else:
-                        app_path = step['app']
+        # map steps to normalized app paths, so different spellings of the
+        # same path are loaded once
+        step_paths = {
+            step_name: os.path.normpath(
+                os.path.join(base_path, step['app'])
+            )
+            for step_name, step in steps.items() if step.get('app')
+        }
+        if not step_paths:
+            return True
+
+        # load each app definition once, preserving step order, remember
+        # the record index of the first app in each file
+        app_list = []
+        path_index = {}
+        for app_path in step_paths.values():
+            if app_path in path_index:
+                continue
+
+            gf_def = Definition()
+            if not gf_def.load(app_path) or not gf_def.apps():
+                Log.an().error('cannot import app: %s', app_path)
+                return False
 
-                    apps = self.import_apps_from_def(app_path)
-                    if not apps:
-                        Log.an().error(
-                            'cannot import app: %s', app_path
-                        )
-                        return False
+            path_index[app_path] = len(app_list)
+            app_list.extend(
+                self._app_record(app) for app in gf_def.apps().values()
+            )
 
-                    # put ID of first item in dict
-                    app_id = next(iter(apps.values()))
-                    app_dict[step['app']] = app_id
+        # insert all linked apps at once
+        app_ids = self.add_apps(app_list)
+        if not app_ids:
+            Log.an().error(
+                'cannot import apps: %s', ', '.join(path_index)
+            )
+            return False
 
-                # update app_id of workflow
-                step['app_id'] = app_id
+        # update app_id of workflow steps
+        for step_name, app_path in step_paths.items():
+            steps[step_name]['app_id'] = app_ids[path_index[app_path]]
 
         return True
 
 
-    def synchronize_workflow_with_db(self, workflow_dict, workflow_id=None):
+    @staticmethod
+    def _workflow_app_refs(workflow_dicts):
+        """
+        Collect app references of workflow steps.
+
+        Args:
+            workflow_dicts: list of workflow dicts.
+
+        Returns:
+            Tuple of sets (app_ids, app_names). Steps are referenced by
+            app_id if defined, otherwise by app_name.
+
+        """
+        app_ids = set()
+        app_names = set()
+        for workflow_dict in workflow_dicts:
+            for step in workflow_dict['steps'].values():
+                if step['app_id']:
+                    app_ids.add(step['app_id'])
+                else:
+                    app_names.add(step['app_name'])
+
+        return app_ids, app_names
+
+
+    def synchronize_workflow_with_db(
+            self,
+            workflow_dict,
+            workflow_id=None,
+            app_map=None
+    ):
         """
         Verify that workflow steps/apps match database.
 
@@ -1884,6 +2368,8 @@ class DataSource:
             workflow_dict: Dict of workflow to validate.
             workflow_id: ID of workflow to validate. If provided, inserted into
                 workflow_dict.
+            app_map: Result of get_app_map covering the apps referenced by
+                the workflow. If not provided, apps are looked up here.
 
         Returns:
             On success: True.
@@ -1913,6 +2399,19 @@ class DataSource:
                 Log.an().error('cannot change number of steps in workflow')
                 return False
 
+        # look up all referenced apps in a single query, by id if defined,
+        # otherwise by name
+        if app_map is None:
+            app_map = self.get_app_map(
+                *self._workflow_app_refs([workflow_dict])
+            )
+            if app_map is False:
+                Log.an().error(
+                    'cannot get apps by name or id: workflow_name=%s',
+                    workflow_dict['name']
+                )
+                return False
+
         # verify that apps are valid
         for step_name, step in workflow_dict['steps'].items():
 
@@ -1925,31 +2424,23 @@ class DataSource:
                     return False
 
             # verify if app exists
-            app = None
-            app_key = ''
             if step['app_id']:
-                # if app_id is defined, get corresponding app from DB
+                # if app_id is defined, get corresponding app
                 app_key = step['app_id']
-                app = self.get_app_by_id(app_key)
+                app_id = app_map['id'].get(app_key)
 
             else:
                 # otherwise use app name to lookup app
                 app_key = step['app_name']
-                app = self.get_app_by_name(app_key)
-
-            if app is False:
-                Log.an().error(
-                    'cannot get app by name or id: app_key=%s', app_key
-                )
-                return False
+                app_id = app_map['name'].get(app_key)
 
-            if not app:
+            if not app_id:
                 # no app found by that name/id
                 Log.an().error('invalid app: app_key=%s', app_key)
                 return False
 
             # update app_id and step_id
-            step['app_id'] = app[0]['id']
+            step['app_id'] = app_id
             # update step_id if workflow_id provided
             if workflow_dict['workflow_id']:
                 step['step_id'] = step_map_db[step_name]
@@ -1957,6 +2448,51 @@ class DataSource:
         return True
 
 
+    @staticmethod
+    def _step_order(steps):
+        """
+        Order workflow steps so that each step follows its dependencies.
+
+        Uses Kahn's algorithm, steps without dependencies between them keep
+        their definition order.
+
+        Args:
+            steps: dict of workflow steps, keyed by step name, each with a
+                'depend' list of step names.
+
+        Returns:
+            On success: list of step names in dependency order.
+            On failure: False, if dependencies contain a cycle.
+
+        """
+        in_degree = {}
+        children = {step_name: [] for step_name in steps}
+        for step_name, step in steps.items():
+            depend_list = [
+                depend for depend in step['depend'] if depend in steps
+            ]
+            in_degree[step_name] = len(depend_list)
+            for depend in depend_list:
+                children[depend].append(step_name)
+
+        queue = deque(
+            step_name for step_name in steps if not in_degree[step_name]
+        )
+        step_names = []
+        while queue:
+            step_name = queue.popleft()
+            step_names.append(step_name)
+            for child in children[step_name]:
+                in_degree[child] -= 1
+                if not in_degree[child]:
+                    queue.append(child)
+
+        if len(step_names) != len(steps):
+            return False
+
+        return step_names
+
+
     def import_workflow_steps_from_dict(self, workflow_dict, workflow_id=None):
         """
         Add workflow steps to DB from workflow dict.
@@ -1982,27 +2518,39 @@ class DataSource:
             Log.an().error('workflow_id required for importing steps')
             return False
 
-        step_name2id = {}
+        steps = workflow_dict['steps']
+        step_names = self._step_order(steps)
+        if step_names is False:
+            Log.an().error(
+                'cannot order workflow steps, dependencies contain a cycle'
+            )
+            return False
 
-        for step_name, step in workflow_dict['steps'].items():
-            step_id = self.add_step({
+        # insert steps in dependency order with a single bulk insert
+        step_ids = self.add_steps([
+            {
                 'workflow_id': workflow_dict['workflow_id'],
-                'app_id': step['app_id'],
+                'app_id': steps[step_name]['app_id'],
                 'name': step_name,
-                'number': step['number'],
-                'letter': step['letter'],
-                'map_uri': step['map']['uri'],
-                'map_regex': step['map']['regex'],
-                'template': json.dumps(step['template']),
-                'exec_context': step['execution']['context'],
-                'exec_method': step['execution']['method']
-            })
-            if not step_id:
-                Log.an().error('cannot add workflow step: %s', step_name)
-                return False
+                'number': steps[step_name]['number'],
+                'letter': steps[step_name]['letter'],
+                'map_uri': steps[step_name]['map']['uri'],
+                'map_regex': steps[step_name]['map']['regex'],
+                'template': json_dumps(steps[step_name]['template']),
+                'exec_context': steps[step_name]['execution']['context'],
+                'exec_method': steps[step_name]['execution']['method']
+            } for step_name in step_names
+        ])
+        if not step_ids:
+            Log.an().error(
+                'cannot add workflow steps: %s', ', '.join(step_names)
+            )
+            return False
 
+        step_name2id = {}
+        for step_name, step_id in zip(step_names, step_ids):
             # add new step id to dict
-            step['step_id'] = step_id
+            steps[step_name]['step_id'] = step_id
             # update step name to id mapping
             step_name2id[step_name] = step_id
 
@@ -2047,7 +2595,7 @@ class DataSource:
                         'letter': step['letter'],
                         'map_uri': step['map']['uri'],
                         'map_regex': step['map']['regex'],
-                        'template': json.dumps(step['template']),
+                        'template': json_dumps(step['template']),
                         'exec_context': step['execution']['context'],
                         'exec_method': step['execution']['method']
                     }
@@ -2076,25 +2624,209 @@ class DataSource:
             On failure: False.
 
         """
+        depends = []
         for step in workflow_dict['steps'].values():
             depend_list = step['depend']
             if not depend_list:
                 depend_list = ['root']
             for depend in depend_list:
-                parent_id = depend if depend == 'root' else step_name2id[depend]
-                if not self.add_depend({
-                        'child_id': step['step_id'],
-                        'parent_id': parent_id
-                }):
-                    Log.an().error(
-                        'cannot add step dependency (parent->step): %s->%s',
-                        depend, step['name']
+                depends.append({
+                    'child_id': step['step_id'],
+                    'parent_id': (
+                        depend if depend == 'root' else step_name2id[depend]
                     )
-                    return False
+                })
+
+        # insert all step dependencies at once
+        if not self.add_depends(depends):
+            Log.an().error(
+                'cannot add step dependencies for workflow: %s',
+                workflow_dict['name']
+            )
+            return False
 
         return True
 
 
+    @staticmethod
+    def _workflow_content_hash(workflow_dict, app_map):
+        """
+        Calculate a SHA-256 digest of a validated workflow definition.
+
+        The digest includes the IDs of the apps that the steps resolve to, so
+        a workflow is not reused after its apps were re-imported or deleted.
+
+        Args:
+            workflow_dict: dict of validated workflow.
+            app_map: result of get_app_map covering the workflow's apps.
+
+        Returns:
+            Hex digest string, or '' for workflows that reference app
+            definition files, since changes to those files don't change the
+            workflow definition, or that reference apps that don't exist.
+
+        """
+        app_ids = {}
+        for step_name, step in workflow_dict['steps'].items():
+            if step.get('app'):
+                return ''
+
+            if step['app_id']:
+                app_ids[step_name] = app_map['id'].get(step['app_id'])
+            else:
+                app_ids[step_name] = app_map['name'].get(step['app_name'])
+
+            if not app_ids[step_name]:
+                return ''
+
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    'workflow': {
+                        key: value for key, value in workflow_dict.items()
+                        if key != 'content_hash'
+                    },
+                    'app_ids': app_ids
+                },
+                sort_keys=True,
+                default=str
+            ).encode()
+        ).hexdigest()
+
+
+    def _get_workflows_by_content(self, workflow_dicts):
+        """
+        Find workflows previously imported with identical definitions.
+
+        Sets 'content_hash' of each workflow dict.
+
+        Args:
+            workflow_dicts: list of validated workflow dicts.
+
+        Returns:
+            On success: dict mapping workflow names to IDs of existing
+                workflows with the same name and content hash.
+            On failure: False.
+
+        """
+        # workflows that reference app definition files are never reused
+        hashable = []
+        for workflow_dict in workflow_dicts:
+            workflow_dict['content_hash'] = ''
+            if not any(
+                    step.get('app') for step in workflow_dict['steps'].values()
+            ):
+                hashable.append(workflow_dict)
+
+        if not hashable:
+            return {}
+
+        app_map = self.get_app_map(*self._workflow_app_refs(hashable))
+        if app_map is False:
+            return False
+
+        for workflow_dict in hashable:
+            workflow_dict['content_hash'] \
+                = self._workflow_content_hash(workflow_dict, app_map)
+
+        content_hashes = {
+            workflow_dict['content_hash'] for workflow_dict in workflow_dicts
+            if workflow_dict['content_hash']
+        }
+        if not content_hashes:
+            return {}
+
+        try:
+            result = self._session.query(
+                WorkflowEntity.id,
+                WorkflowEntity.name,
+                WorkflowEntity.content_hash
+            ).\
+                filter(WorkflowEntity.content_hash.in_(content_hashes)).\
+                all()
+        except SQLAlchemyError as err:
+            Log.an().error('sql exception [%s]', str(err))
+            return False
+
+        existing = {(row[1], row[2]): row[0] for row in result}
+
+        return {
+            workflow_dict['name']: existing[
+                (workflow_dict['name'], workflow_dict['content_hash'])
+            ]
+            for workflow_dict in workflow_dicts
+            if (workflow_dict['name'], workflow_dict['content_hash'])
+            in existing
+        }
+
+
+    def _import_workflow(self, valid_def, app_map):
+        """
+        Add a single validated workflow with its steps and dependencies.
+
+        Args:
+            valid_def: dict of validated workflow, linked apps already added.
+            app_map: result of get_app_map covering the workflow's apps.
+
+        Returns:
+            On success: ID of the new workflow.
+            On failure: False.
+
+        """
+        if not self.synchronize_workflow_with_db(
+                valid_def, app_map=app_map
+        ):
+            Log.an().error(
+                'cannot synchronize workflow with data source: workflow_name=%s',
+                valid_def['name']
+            )
+            return False
+
+        # insert workflow record
+        workflow_id = self.add_workflow({
+            'name'              : valid_def['name'],
+            'description'       : valid_def['description'],
+            'username'          : valid_def['username'],
+            'inputs'            : json_dumps(valid_def['inputs']),
+            'repo_uri'          : valid_def['repo_uri'],
+            'documentation_uri' : valid_def['documentation_uri'],
+            'parameters'        : json_dumps(valid_def['parameters']),
+            'final_output'      : json_dumps(valid_def['final_output']),
+            'public'            : valid_def['public'],
+            'enable'            : valid_def['enable'],
+            'test'              : valid_def['test'],
+            'version'           : valid_def['version'],
+            'content_hash'      : valid_def.get('content_hash', '')
+        })
+        if not workflow_id:
+            Log.an().error(
+                'cannot add workflow to data source: workflow_name=%s',
+                valid_def['name']
+            )
+            return False
+
+        valid_def['workflow_id'] = workflow_id
+
+        # insert steps, create map of steps
+        step_name2id = self.import_workflow_steps_from_dict(valid_def)
+        if not step_name2id:
+            Log.an().error(
+                'cannot add workflow steps to database: workflow_name=%s',
+                valid_def['name']
+            )
+            return False
+
+        # insert dependency records
+        if not self.import_step_depends_from_dict(valid_def, step_name2id):
+            Log.an().error(
+                'cannot add workflow step dependencies: workflow_name=%s',
+                valid_def['name']
+            )
+            return False
+
+        return workflow_id
+
+
     def import_workflows_from_dict(
             self, workflows_dict, validate=True, base_path=''
         ):
@@ -2110,18 +2842,40 @@ class DataSource:
             On failure: False.
 
         """
-        workflow_name2id = {}
-        for workflow in iter(workflows_dict.values()):
+        workflows = list(workflows_dict.values())
 
-            valid_def = {}
-            if validate:
-                valid_def = Definition.validate_workflow(workflow)
-                if valid_def is False:
-                    Log.an().error('invalid workflow:\n%s', yaml.dump(workflow))
-                    return False
+        validated = workflows
+        if validate:
+            validated = [
+                Definition.validate_workflow(workflow)
+                for workflow in workflows
+            ]
 
-            else:
-                valid_def = workflow
+        for workflow, valid_def in zip(workflows, validated):
+            if valid_def is False:
+                Log.an().error('invalid workflow:\n%s', LazyYaml(workflow))
+                return False
+
+        # create result dict at its final size, IDs are filled in below
+        workflow_name2id = dict.fromkeys(
+            valid_def['name'] for valid_def in validated
+        )
+
+        # reuse workflows that were already imported with identical content
+        existing = self._get_workflows_by_content(validated)
+        if existing is False:
+            Log.an().error('cannot look up previously imported workflows')
+            return False
+
+        valid_defs = []
+        for valid_def in validated:
+
+            if valid_def['name'] in existing:
+                workflow_name2id[valid_def['name']] = existing[
+                    valid_def['name']
+                ]
+                valid_def['workflow_id'] = workflow_name2id[valid_def['name']]
+                continue
 
             if not self.add_linked_apps(valid_def, base_path):
                 Log.an().error(
@@ -2130,54 +2884,36 @@ class DataSource:
                 )
                 return False
 
-            if not self.synchronize_workflow_with_db(valid_def):
-                Log.an().error(
-                    'cannot synchronize workflow with data source: workflow_name=%s',
-                    valid_def['name']
-                )
+            valid_defs.append(valid_def)
+
+        # look up apps referenced by all workflows at once
+        app_map = self.get_app_map(*self._workflow_app_refs(valid_defs))
+        if app_map is False:
+            Log.an().error('cannot get apps referenced by workflows')
+            return False
+
+        for valid_def in valid_defs:
+
+            # insert each workflow in a savepoint, so a failed workflow
+            # doesn't leave partial records in the session transaction
+            try:
+                savepoint = self._session.begin_nested()
+            except SQLAlchemyError as err:
+                Log.an().error('sql exception [%s]', str(err))
                 return False
 
-            # insert workflow record
-            workflow_id = self.add_workflow({
-                'name'              : valid_def['name'],
-                'description'       : valid_def['description'],
-                'username'          : valid_def['username'],
-                'inputs'            : json.dumps(valid_def['inputs']),
-                'repo_uri'          : valid_def['repo_uri'],
-                'documentation_uri' : valid_def['documentation_uri'],
-                'parameters'        : json.dumps(valid_def['parameters']),
-                'final_output'      : json.dumps(valid_def['final_output']),
-                'public'            : valid_def['public'],
-                'enable'            : valid_def['enable'],
-                'test'              : valid_def['test'],
-                'version'           : valid_def['version']
-            })
+            workflow_id = self._import_workflow(valid_def, app_map)
             if not workflow_id:
-                Log.an().error(
-                    'cannot add workflow to data source: workflow_name=%s',
-                    valid_def['name']
-                )
+                savepoint.rollback()
                 return False
 
-            workflow_name2id[valid_def['name']] = workflow_id
-            valid_def['workflow_id'] = workflow_id
-
-            # insert steps, create map of steps
-            step_name2id = self.import_workflow_steps_from_dict(valid_def)
-            if not step_name2id:
-                Log.an().error(
-                    'cannot add workflow steps to database: workflow_name=%s',
-                    valid_def['name']
-                )
+            try:
+                savepoint.commit()
+            except SQLAlchemyError as err:
+                Log.an().error('sql exception [%s]', str(err))
                 return False
 
-            # insert dependency records
-            if not self.import_step_depends_from_dict(valid_def, step_name2id):
-                Log.an().error(
-                    'cannot add workflow step dependencies: workflow_name=%s',
-                    valid_def['name']
-                )
-                return False
+            workflow_name2id[valid_def['name']] = workflow_id
 
         return workflow_name2id
 
@@ -2228,7 +2964,7 @@ class DataSource:
             return False
 
         # delete by id or name
-        for workflow in iter(gf_def.workflows().values()):
+        for workflow in gf_def.workflows().values():
             if workflow['workflow_id']:
                 if not self.delete_workflow_by_id(workflow['id']):
                     Log.an().error(
@@ -2272,7 +3008,7 @@ class DataSource:
             valid_def = Definition.validate_workflow(workflow_dict)
             if valid_def is False:
                 Log.an().error(
-                    'invalid workflow:\n%s', yaml.dump(workflow_dict)
+                    'invalid workflow:\n%s', LazyYaml(workflow_dict)
                 )
                 return False
 
@@ -2300,13 +3036,15 @@ class DataSource:
                     'username':          valid_def['username'],
                     'repo_uri':          valid_def['repo_uri'],
                     'documentation_uri': valid_def['documentation_uri'],
-                    'inputs':            json.dumps(valid_def['inputs']),
-                    'parameters':        json.dumps(valid_def['parameters']),
-                    'final_output':      json.dumps(valid_def['final_output']),
+                    'inputs':            json_dumps(valid_def['inputs']),
+                    'parameters':        json_dumps(valid_def['parameters']),
+                    'final_output':      json_dumps(valid_def['final_output']),
                     'public':            valid_def['public'],
                     'enable':            valid_def['enable'],
                     'test':              valid_def['test'],
-                    'version':           valid_def['version']
+                    'version':           valid_def['version'],
+                    # updated workflows aren't reused by later imports
+                    'content_hash':      ''
                 }
         ):
             Log.an().error(
@@ -2363,19 +3101,19 @@ class DataSource:
             Log.an().error('invalid geneflow definition: %s', def_path)
             return False
 
-        if not gf_def.workflows():
+        workflows = gf_def.workflows()
+        if not workflows:
             Log.an().error('no workflows in geneflow definition')
             return False
 
+        # can only update one at a time, so take first in list
+        workflow = next(iter(workflows.values()))
+
         # insert workflow_id into first definition if provided
         if workflow_id:
-            next(iter(gf_def.workflows().values()))['workflow_id']\
-                = workflow_id
+            workflow['workflow_id'] = workflow_id
 
-        # can only update one at a time, so take first in list
-        return self.update_workflow_from_dict(
-            next(iter(gf_def.workflows().values())), validate=False
-        )
+        return self.update_workflow_from_dict(workflow, validate=False)
 
 
     # Jobs
@@ -2428,19 +3166,30 @@ class DataSource:
             On failure: False.
 
         """
-        job_name2id = {}
-        for job in iter(jobs_dict.values()):
+        # validate all jobs before adding any of them
+        valid_defs = []
+        for job in jobs_dict.values():
 
             valid_def = {}
             if validate:
                 valid_def = Definition.validate_job(job)
                 if valid_def is False:
-                    Log.an().error('invalid job:\n%s', yaml.dump(job))
+                    Log.an().error('invalid job:\n%s', LazyYaml(job))
                     return False
 
             else:
                 valid_def = job
 
+            valid_defs.append(valid_def)
+
+        # create result dict at its final size, IDs are filled in below
+        job_name2id = dict.fromkeys(
+            valid_def['name'] for valid_def in valid_defs
+        )
+        # steps of each workflow, queried once per workflow
+        workflow_steps = {}
+        for valid_def in valid_defs:
+
             if not self.synchronize_job_with_db(valid_def):
                 Log.an().error(
                     'cannot synchronize job with data source: job_name=%s',
@@ -2453,15 +3202,15 @@ class DataSource:
                 'workflow_id'   : valid_def['workflow_id'],
                 'name'          : valid_def['name'],
                 'username'      : valid_def['username'],
-                'work_uri'      : json.dumps(valid_def['work_uri']),
+                'work_uri'      : json_dumps(valid_def['work_uri']),
                 'no_output_hash': valid_def['no_output_hash'],
-                'inputs'        : json.dumps(valid_def['inputs']),
-                'parameters'    : json.dumps(valid_def['parameters']),
+                'inputs'        : json_dumps(valid_def['inputs']),
+                'parameters'    : json_dumps(valid_def['parameters']),
                 'output_uri'    : valid_def['output_uri'],
-                'final_output'  : json.dumps(valid_def['final_output']),
-                'exec_context'  : json.dumps(valid_def['execution']['context']),
-                'exec_method'   : json.dumps(valid_def['execution']['method']),
-                'notifications' : json.dumps(valid_def['notifications'])
+                'final_output'  : json_dumps(valid_def['final_output']),
+                'exec_context'  : json_dumps(valid_def['execution']['context']),
+                'exec_method'   : json_dumps(valid_def['execution']['method']),
+                'notifications' : json_dumps(valid_def['notifications'])
             })
             if not job_id:
                 Log.an().error(
@@ -2474,7 +3223,10 @@ class DataSource:
             valid_def['job_id'] = job_id
 
             # insert job step records
-            steps = self.get_step_by_workflow_id(valid_def['workflow_id'])
+            steps = workflow_steps.get(valid_def['workflow_id'])
+            if not steps:
+                steps = self.get_step_by_workflow_id(valid_def['workflow_id'])
+                workflow_steps[valid_def['workflow_id']] = steps
             if not steps:
                 Log.an().error(
                     'cannot get steps for workflow: workflow_id=%s',
@@ -2482,16 +3234,12 @@ class DataSource:
                 )
                 return False
 
-            for step in steps:
-                if not self.add_job_step({
-                        'job_id': job_id,
-                        'step_id': step['id']
-                }):
-                    Log.an().error(
-                        'cannot add job step: job_id=%s, step_name=%s',
-                        job_id, step['name']
-                    )
-                    return False
+            if not self.add_job_steps([
+                    {'job_id': job_id, 'step_id': step['id']}
+                    for step in steps
+            ]):
+                Log.an().error('cannot add job steps: job_id=%s', job_id)
+                return False
 
         return job_name2id
 
@@ -0,0 +1,7 @@
+# migration 20261016-01
+#
+# Add content_hash column to workflow table
+#
+
+from yoyo import step
+step("ALTER TABLE workflow ADD COLUMN content_hash CHAR(64) NOT NULL DEFAULT '' AFTER test")
@@ -23,6 +23,7 @@ CREATE TABLE workflow (
     public TINYINT NOT NULL DEFAULT 0,
     enable TINYINT NOT NULL DEFAULT 1,
     test TINYINT NOT NULL DEFAULT 0,
+    content_hash CHAR(64) NOT NULL DEFAULT '',
     created TIMESTAMP DEFAULT '0000-00-00 00:00:00',
     modified TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (id)
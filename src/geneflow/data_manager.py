@@ -15,6 +15,16 @@ class DataManager:
     Currently, these contexts include: local, agave.
     """
 
+    # context functions keyed by scheme, populated by init()
+    _LIST = {}
+    _EXISTS = {}
+    _DELETE = {}
+    _MKDIR = {}
+    _MKDIR_RECURSIVE = {}
+    # copy functions and the contexts they take options for, keyed by src
+    # scheme, then dest scheme
+    _COPY = {}
+
     @classmethod
     def list(cls, uri=None, parsed_uri=None, **kwargs):
         """
@@ -42,9 +52,8 @@ class DataManager:
                 return False
 
         # check if list method exists for context
-        try:
-            list_func = getattr(cls, '_list_{}'.format(parsed_uri['scheme']))
-        except AttributeError:
+        list_func = cls._LIST.get(parsed_uri['scheme'])
+        if not list_func:
             Log.an().error('_list_%s method not defined', parsed_uri['scheme'])
             return False
 
@@ -78,11 +87,8 @@ class DataManager:
                 return None
 
         # check if the exists method exists for context
-        try:
-            exists_func = getattr(cls, '_exists_{}'\
-                .format(parsed_uri['scheme']))
-
-        except AttributeError:
+        exists_func = cls._EXISTS.get(parsed_uri['scheme'])
+        if not exists_func:
             Log.an().error(
                 '_exists_%s method not defined', parsed_uri['scheme']
             )
@@ -118,11 +124,8 @@ class DataManager:
                 return False
 
         # check if the delete method exists for context
-        try:
-            delete_func = getattr(cls, '_delete_{}'\
-                .format(parsed_uri['scheme']))
-
-        except AttributeError:
+        delete_func = cls._DELETE.get(parsed_uri['scheme'])
+        if not delete_func:
             Log.an().error(
                 '_delete_%s method not defined', parsed_uri['scheme']
             )
@@ -161,11 +164,8 @@ class DataManager:
 
         # check if the mkdir method exists for context
         if recursive:
-            try:
-                mkdir_func = getattr(cls, '_mkdir_recursive_{}'\
-                    .format(parsed_uri['scheme']))
-
-            except AttributeError:
+            mkdir_func = cls._MKDIR_RECURSIVE.get(parsed_uri['scheme'])
+            if not mkdir_func:
                 Log.an().error(
                     '_mkdir_recursive_%s method not defined',
                     parsed_uri['scheme']
@@ -173,18 +173,15 @@ class DataManager:
                 return False
 
         else:
-            try:
-                mkdir_func = getattr(cls, '_mkdir_{}'\
-                    .format(parsed_uri['scheme']))
-
-            except AttributeError:
+            mkdir_func = cls._MKDIR.get(parsed_uri['scheme'])
+            if not mkdir_func:
                 Log.an().error(
                     '_mkdir_%s method not defined', parsed_uri['scheme']
                 )
                 return False
 
         # always remove final slash from URI before calling mkdir
-        return mkdir_func(URIParser.parse(parsed_uri['chopped_uri']), **kwargs)
+        return mkdir_func(URIParser.chop(parsed_uri), **kwargs)
 
 
     @classmethod
@@ -227,11 +224,10 @@ class DataManager:
                 return False
 
         # check if copy method exists for contexts
-        try:
-            copy_func = getattr(cls, '_copy_{}_{}'.format(
-                parsed_src_uri['scheme'], parsed_dest_uri['scheme']
-            ))
-        except AttributeError:
+        copy_entry = cls._COPY.get(parsed_src_uri['scheme'], {}).get(
+            parsed_dest_uri['scheme']
+        )
+        if not copy_entry:
             Log.an().error(
                 '_copy_%s_%s method not defined',
                 parsed_src_uri['scheme'],
@@ -239,15 +235,11 @@ class DataManager:
             )
             return False
 
+        copy_func, contexts = copy_entry
         return copy_func(
             parsed_src_uri,
             parsed_dest_uri,
-            **{
-                list_item: kwargs[list_item]
-                for list_item in set(
-                    [parsed_src_uri['scheme'], parsed_dest_uri['scheme']]
-                )
-            }
+            **{context: kwargs[context] for context in contexts}
         )
 
 
@@ -257,5 +249,27 @@ def init():
     for func in all_funcs:
         setattr(DataManager, func[0], staticmethod(func[1]))
 
+    # build dispatch tables so context methods are found with a dict lookup,
+    # check _mkdir_recursive_ before its _mkdir_ prefix
+    dispatch = [
+        ('_list_', DataManager._LIST),
+        ('_exists_', DataManager._EXISTS),
+        ('_delete_', DataManager._DELETE),
+        ('_mkdir_recursive_', DataManager._MKDIR_RECURSIVE),
+        ('_mkdir_', DataManager._MKDIR)
+    ]
+    for name, func in all_funcs:
+        if name.startswith('_copy_'):
+            src_scheme, _, dest_scheme = name[len('_copy_'):].partition('_')
+            DataManager._COPY.setdefault(src_scheme, {})[dest_scheme] = (
+                func, tuple({src_scheme, dest_scheme})
+            )
+            continue
+
+        for prefix, table in dispatch:
+            if name.startswith(prefix):
+                table[name[len(prefix):]] = func
+                break
+
 # initialize the module when imported
 init()
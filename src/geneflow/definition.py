@@ -1,15 +1,73 @@
 """This module contains the GeneFlow Definition class."""
 
+import collections
 import copy
+import hashlib
+import json
 import pprint
+import threading
 
 import cerberus
 import yaml
 
-from geneflow.log import Log
+# use the libyaml parser if PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+from geneflow.log import LazyYaml, Log
 
 GF_VERSION = 'v1.0'
 
+# schemas of the inputs and parameters of apps and workflows
+_INPUT_SCHEMA = {
+    'label': {'type': 'string', 'required': True},
+    'description': {'type': 'string', 'default': ''},
+    'type': {
+        'type': 'string',
+        'required': True,
+        'default': 'Any',
+        'allowed': ['File', 'Directory', 'Any']
+    },
+    'default': {'type': 'string', 'default': ''},
+    'value': {'type': 'string', 'default': ''}
+}
+
+_PARAMETER_SCHEMA = {
+    'label': {'type': 'string', 'required': True},
+    'description': {'type': 'string', 'default': ''},
+    'type': {
+        'type': 'string',
+        'required': True,
+        'default': 'Any',
+        'allowed': [
+            'File', 'Directory', 'string', 'int',
+            'float', 'double', 'long', 'Any'
+        ]
+    },
+    'default': {'nullable': True, 'default': None},
+    'value': {'nullable': True, 'default': None}
+}
+
+# workflow inputs and parameters can additionally be hidden or disabled
+_VISIBILITY_SCHEMA = {
+    'enable': {'type': 'boolean', 'default': True},
+    'visible': {'type': 'boolean', 'default': True}
+}
+
+# step and job execution methods
+_EXECUTION_METHODS = [
+    'auto',
+    'package',
+    'cdc-shared-package',
+    'singularity',
+    'cdc-shared-singularity',
+    'docker',
+    'environment',
+    'module'
+]
+
 WORKFLOW_SCHEMA = {
     'v1.0': {
         'gfVersion': {
@@ -34,20 +92,7 @@ WORKFLOW_SCHEMA = {
             'valueschema': {
                 'type': 'dict',
                 'required': True,
-                'schema': {
-                    'label': {'type': 'string', 'required': True},
-                    'description': {'type': 'string', 'default': ''},
-                    'type': {
-                        'type': 'string',
-                        'required': True,
-                        'default': 'Any',
-                        'allowed': ['File', 'Directory', 'Any']
-                    },
-                    'default': {'type': 'string', 'default': ''},
-                    'enable': {'type': 'boolean', 'default': True},
-                    'visible': {'type': 'boolean', 'default': True},
-                    'value': {'type': 'string', 'default': ''}
-                }
+                'schema': dict(_INPUT_SCHEMA, **_VISIBILITY_SCHEMA)
             }
         },
         'parameters': {
@@ -56,23 +101,7 @@ WORKFLOW_SCHEMA = {
             'valueschema': {
                 'type': 'dict',
                 'required': True,
-                'schema': {
-                    'label': {'type': 'string', 'required': True},
-                    'description': {'type': 'string', 'default': ''},
-                    'type': {
-                        'type': 'string',
-                        'required': True,
-                        'default': 'Any',
-                        'allowed': [
-                            'File', 'Directory', 'string', 'int',
-                            'float', 'double', 'long', 'Any'
-                        ]
-                    },
-                    'default': {'nullable': True, 'default': None},
-                    'enable': {'type': 'boolean', 'default': True},
-                    'visible': {'type': 'boolean', 'default': True},
-                    'value': {'nullable': True, 'default': None}
-                }
+                'schema': dict(_PARAMETER_SCHEMA, **_VISIBILITY_SCHEMA)
             }
         },
         'final_output': {
@@ -128,16 +157,7 @@ WORKFLOW_SCHEMA = {
                             'method': {
                                 'type': 'string',
                                 'default': 'auto',
-                                'allowed': [
-                                    'auto',
-                                    'package',
-                                    'cdc-shared-package',
-                                    'singularity',
-                                    'cdc-shared-singularity',
-                                    'docker',
-                                    'environment',
-                                    'module'
-                                ]
+                                'allowed': _EXECUTION_METHODS
                             }
                         }
                     }
@@ -172,18 +192,7 @@ APP_SCHEMA = {
             'valueschema': {
                 'type': 'dict',
                 'required': True,
-                'schema': {
-                    'label': {'type': 'string', 'required': True},
-                    'description': {'type': 'string', 'default': ''},
-                    'type': {
-                        'type': 'string',
-                        'required': True,
-                        'default': 'Any',
-                        'allowed': ['File', 'Directory', 'Any']
-                    },
-                    'default': {'type': 'string', 'default': ''},
-                    'value': {'type': 'string', 'default': ''}
-                }
+                'schema': _INPUT_SCHEMA
             }
         },
         'parameters': {
@@ -192,21 +201,7 @@ APP_SCHEMA = {
             'valueschema': {
                 'type': 'dict',
                 'required': True,
-                'schema': {
-                    'label': {'type': 'string', 'required': True},
-                    'description': {'type': 'string', 'default': ''},
-                    'type': {
-                        'type': 'string',
-                        'required': True,
-                        'default': 'Any',
-                        'allowed': [
-                            'File', 'Directory', 'string', 'int',
-                            'float', 'double', 'long', 'Any'
-                        ]
-                    },
-                    'default': {'nullable': True, 'default': None},
-                    'value': {'nullable': True, 'default': None}
-                }
+                'schema': _PARAMETER_SCHEMA
             }
         },
         'definition': {
@@ -290,16 +285,7 @@ JOB_SCHEMA = {
                     'valueschema': {
                         'type': 'string',
                         'default': 'auto',
-                        'allowed': [
-                            'auto',
-                            'package',
-                            'cdc-shared-package',
-                            'singularity',
-                            'cdc-shared-singularity',
-                            'docker',
-                            'environment',
-                            'module'
-                        ]
+                        'allowed': _EXECUTION_METHODS
                     }
                 }
             }
@@ -326,6 +312,25 @@ JOB_SCHEMA = {
 }
 
 
+class _LazyPretty:
+    """
+    Defer pretty-printing of a log argument until it's formatted.
+
+    Logging only calls str() on arguments of records that are emitted, so
+    validation errors are not formatted if the record is filtered out.
+    """
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        """Wrap object to format."""
+        self.obj = obj
+
+    def __str__(self):
+        """Pretty-print wrapped object."""
+        return pprint.pformat(self.obj)
+
+
 class Definition:
     """
     GeneFlow Definition class.
@@ -334,12 +339,180 @@ class Definition:
     definition YAML file and job definition YAML file.
     """
 
+    __slots__ = ('_apps', '_workflows', '_jobs', '_fingerprints')
+
+    # schema validators are built once per thread and reused for every
+    # validation, since a validator keeps state between calls
+    _validators = threading.local()
+
+    # validated definitions keyed by schema name and content digest, least
+    # recently used first
+    _VALIDATED_CACHE_SIZE = 512
+    _validated_cache = collections.OrderedDict()
+    _validated_cache_lock = threading.Lock()
+
+    # report the yaml loader in use the first time a file is loaded
+    _loader_logged = False
+
     def __init__(self):
         """Initialize Definition class with default values."""
         self._apps = {}
         self._workflows = {}
         self._jobs = {}
 
+        # content fingerprints of added definitions, so that re-adding an
+        # identical definition is skipped
+        self._fingerprints = set()
+
+
+    @classmethod
+    def _validator(cls, name, schema):
+        """
+        Get the calling thread's validator for a schema.
+
+        Args:
+            name: name of the validator, e.g., 'app'.
+            schema: dict of schemas keyed by GeneFlow version.
+
+        Returns:
+            cerberus.Validator for the current GeneFlow version.
+
+        """
+        validator = getattr(cls._validators, name, None)
+        if validator is None:
+            validator = cerberus.Validator(schema[GF_VERSION])
+            setattr(cls._validators, name, validator)
+
+        return validator
+
+
+    @classmethod
+    def _validated(cls, name, schema, definition):
+        """
+        Validate and normalize a definition.
+
+        Args:
+            name: name of the validator, e.g., 'app'.
+            schema: dict of schemas keyed by GeneFlow version.
+            definition: dict of the definition to validate.
+
+        Returns:
+            Tuple of the normalized definition, or None if invalid, and a dict
+            of validation errors.
+
+        """
+        validator = cls._validator(name, schema)
+        valid_def = validator.validated(definition)
+
+        return valid_def, validator.errors
+
+
+    @classmethod
+    def _is_json_native(cls, obj):
+        """
+        Check whether an object is made of native JSON types only.
+
+        Only such objects serialize to JSON without losing type information,
+        e.g., a date and its string, or a tuple and a list, serialize alike.
+
+        Args:
+            obj: object to check.
+
+        Returns:
+            True if obj only contains dicts with string keys, lists, strings,
+            numbers, booleans and None, otherwise False.
+
+        """
+        if isinstance(obj, dict):
+            return all(
+                type(key) is str and cls._is_json_native(value)
+                for key, value in obj.items()
+            )
+
+        if isinstance(obj, list):
+            return all(cls._is_json_native(item) for item in obj)
+
+        return obj is None or type(obj) in (str, int, float, bool)
+
+
+    @classmethod
+    def _cache_key(cls, name, definition):
+        """
+        Calculate the validation cache key of a definition.
+
+        Args:
+            name: name of the schema, e.g., 'app'.
+            definition: dict of the definition to validate.
+
+        Returns:
+            On success: Tuple of schema name and content digest.
+            On failure: None, if the definition contains values that aren't
+                native JSON types and can't be keyed faithfully.
+
+        """
+        if not cls._is_json_native(definition):
+            return None
+
+        content = json.dumps(definition, sort_keys=True)
+
+        return (name, hashlib.sha1(content.encode()).digest())
+
+
+    @classmethod
+    def _cache_get(cls, key):
+        """
+        Get a copy of a previously validated definition.
+
+        Args:
+            key: validation cache key.
+
+        Returns:
+            Dict of the validated definition, or None if not cached.
+
+        """
+        if key is None:
+            return None
+
+        with cls._validated_cache_lock:
+            valid_def = cls._validated_cache.get(key)
+            if valid_def is None:
+                return None
+            cls._validated_cache.move_to_end(key)
+
+        # callers may modify the definition, so never hand out the cached one
+        return copy.deepcopy(valid_def)
+
+
+    @classmethod
+    def _cache_put(cls, key, valid_def):
+        """
+        Add a copy of a validated definition to the validation cache.
+
+        Args:
+            key: validation cache key.
+            valid_def: dict of the validated definition.
+
+        Returns:
+            None.
+
+        """
+        if key is None:
+            return
+
+        valid_def = copy.deepcopy(valid_def)
+        with cls._validated_cache_lock:
+            cls._validated_cache[key] = valid_def
+            if len(cls._validated_cache) > cls._VALIDATED_CACHE_SIZE:
+                cls._validated_cache.popitem(last=False)
+
+
+    @classmethod
+    def _log_loader(cls):
+        """Log the YAML loader in use the first time a file is loaded."""
+        if not cls._loader_logged:
+            Log.a().debug('yaml loader: %s', SafeLoader.__name__)
+            cls._loader_logged = True
+
 
     @classmethod
     def load_yaml(cls, yaml_path):
@@ -356,17 +529,17 @@ class Definition:
             List of dicts.
 
         """
+        cls._log_loader()
+
+        # parse directly from the file instead of reading it into a string
         try:
-            with open(yaml_path, 'rU') as yaml_file:
-                yaml_data = yaml_file.read()
+            with open(yaml_path, 'rb') as yaml_file:
+                yaml_dict = list(yaml.load_all(yaml_file, Loader=SafeLoader))
         except IOError as err:
             Log.an().error(
                 'cannot read yaml file: %s [%s]', yaml_path, str(err)
             )
             return False
-
-        try:
-            yaml_dict = list(yaml.safe_load_all(yaml_data))
         except yaml.YAMLError as err:
             Log.an().error('invalid yaml: %s [%s]', yaml_path, str(err))
             return False
@@ -391,66 +564,96 @@ class Definition:
             On failure: False.
 
         """
-        # load multi-doc yaml file
-        gf_def = self.load_yaml(yaml_path)
-        if gf_def is False:
+        self._log_loader()
+
+        # parse one doc at a time rather than the whole file up front, so
+        # loading stops at the first invalid doc
+        try:
+            with open(yaml_path, 'rb') as yaml_file:
+                for gf_doc in yaml.load_all(yaml_file, Loader=SafeLoader):
+                    if not self._load_doc(gf_doc, yaml_path):
+                        return False
+
+        except IOError as err:
+            Log.an().error(
+                'cannot read yaml file: %s [%s]', yaml_path, str(err)
+            )
             Log.an().error('cannot load yaml file: %s', yaml_path)
             return False
 
-        # iterate through yaml docs
-        for gf_doc in gf_def:
-            # class must be specified, either app or workflow
-            if 'class' not in gf_doc:
-                Log.a().error('unspecified document class')
-                return False
+        except yaml.YAMLError as err:
+            Log.an().error('invalid yaml: %s [%s]', yaml_path, str(err))
+            Log.an().error('cannot load yaml file: %s', yaml_path)
+            return False
+
+        return True
+
+
+    def _load_doc(self, gf_doc, yaml_path):
+        """
+        Validate and add the apps, workflow, or jobs of a YAML doc.
+
+        Args:
+            gf_doc: dict of YAML doc.
+            yaml_path: path to GeneFlow YAML definition file, for logging.
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        # class must be specified, either app or workflow
+        if 'class' not in gf_doc:
+            Log.a().error('unspecified document class')
+            return False
 
-            if gf_doc['class'] == 'app':
-                if 'apps' in gf_doc:
-                    # this is a list of apps
-                    for app in gf_doc['apps']:
-                        if not self.add_app(app):
-                            Log.an().error(
-                                'invalid app in definition: %s', yaml_path
-                            )
-                            return False
-
-                else:
-                    # only one app
-                    if not self.add_app(gf_doc):
+        if gf_doc['class'] == 'app':
+            if 'apps' in gf_doc:
+                # this is a list of apps
+                for app in gf_doc['apps']:
+                    if not self.add_app(app):
                         Log.an().error(
                             'invalid app in definition: %s', yaml_path
                         )
                         return False
 
-            elif gf_doc['class'] == 'workflow':
-                # only one workflow per yaml file allowed
-                if not self.add_workflow(gf_doc):
+            else:
+                # only one app
+                if not self.add_app(gf_doc):
                     Log.an().error(
-                        'invalid workflow in definition: %s', yaml_path
+                        'invalid app in definition: %s', yaml_path
                     )
                     return False
 
-            elif gf_doc['class'] == 'job':
-                if 'jobs' in gf_doc:
-                    # this is a list of jobs
-                    for job in gf_doc['jobs']:
-                        if not self.add_job(job):
-                            Log.an().error(
-                                'invalid job in definition: %s', yaml_path
-                            )
-                            return False
-
-                else:
-                    # only one job
-                    if not self.add_job(gf_doc):
+        elif gf_doc['class'] == 'workflow':
+            # only one workflow per yaml file allowed
+            if not self.add_workflow(gf_doc):
+                Log.an().error(
+                    'invalid workflow in definition: %s', yaml_path
+                )
+                return False
+
+        elif gf_doc['class'] == 'job':
+            if 'jobs' in gf_doc:
+                # this is a list of jobs
+                for job in gf_doc['jobs']:
+                    if not self.add_job(job):
                         Log.an().error(
                             'invalid job in definition: %s', yaml_path
                         )
                         return False
 
             else:
-                Log.a().error('invalid document class: %s', gf_doc['class'])
-                return False
+                # only one job
+                if not self.add_job(gf_doc):
+                    Log.an().error(
+                        'invalid job in definition: %s', yaml_path
+                    )
+                    return False
+
+        else:
+            Log.a().error('invalid document class: %s', gf_doc['class'])
+            return False
 
         return True
 
@@ -458,16 +661,22 @@ class Definition:
     @classmethod
     def validate_app(cls, app_def):
         """Validate app definition."""
-        validator = cerberus.Validator(APP_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(app_def)
+        cache_key = cls._cache_key('app', app_def)
+        valid_def = cls._cache_get(cache_key)
+        if valid_def is not None:
+            return valid_def
+
+        valid_def, errors = cls._validated('app', APP_SCHEMA, app_def)
 
         if not valid_def:
             Log.an().error(
                 'app validation error:\n%s',
-                pprint.pformat(validator.errors)
+                _LazyPretty(errors)
             )
             return False
 
+        cls._cache_put(cache_key, valid_def)
+
         return valid_def
 
 
@@ -478,7 +687,7 @@ class Definition:
 
         Use a topological sort algorithm to calculate step number and validate
         the DAG. Return a workflow dict with populated 'number' and 'letter'
-        numbering.
+        numbering, and each step's 'name' set to its key.
 
         Args:
             workflow_dict: Dict of workflow to number.
@@ -488,82 +697,87 @@ class Definition:
             On failure: False.
 
         """
-        # initial step number
-        number = 1
-
         steps = workflow_dict['steps']
 
-        # indicate if step has been traversed
-        step_status = {}
-        for step in steps:
-            step_status[step] = False
-
-        all_done = False
-        while not all_done:
-            all_done = True
-            steps_done = [] # steps to be set to done on next iter
-            for step in steps:
-                if not step_status[step]:
-                    all_done = False # at least one step found
-                    # get status of all dependencies, and make sure they're
-                    # valid
-                    dep_list = []
-                    for depend in steps[step]['depend']:
-                        if depend not in step_status:
-                            Log.an().error(
-                                'invalid step dependency: %s', depend
-                            )
-                            return False
-
-                        dep_list.append(step_status[depend])
-
-                    if not dep_list or all(dep_list):
-                        # either no dependencies, or all have been traversed
-                        # set step number, allowing ties
-                        steps[step]['number'] = number
-                        # add step to list of traversed
-                        steps_done.append(step)
-
-            if not all_done and not steps_done:
-                # if steps remaining, but none have satisfied dependencies
-                Log.an().error('cycles found in graph')
-                return False
-
-            # mark all steps in steps_done as done, set letter if duplicate
-            # step number
-            letter = ord('a') # parallel steps labeled starting at 'a'
-            for step in sorted(steps_done):
-                step_status[step] = True
-                if len(steps_done) > 1:
-                    steps[step]['letter'] = chr(letter)
-                    letter += 1
+        # make sure all dependencies are valid steps
+        invalid_depends = {
+            depend for step in steps.values() for depend in step['depend']
+        }.difference(steps)
+        if invalid_depends:
+            for depend in sorted(invalid_depends, key=str):
+                Log.an().error('invalid step dependency: %s', depend)
+            return False
 
-            # increment step number
+        # count unresolved dependencies of each step, and map each step to
+        # the steps that depend on it
+        dep_count = {}
+        children = collections.defaultdict(list)
+        for step_name, step in steps.items():
+            dep_count[step_name] = len(step['depend'])
+            for depend in step['depend']:
+                children[depend].append(step_name)
+
+        # traverse the graph one level at a time, all steps of a level share
+        # the same step number
+        level = [step_name for step_name in steps if not dep_count[step_name]]
+        number = 1
+        num_traversed = 0
+        while level:
+            # parallel steps labeled starting at 'a'
+            level.sort()
+            parallel = len(level) > 1
+            for index, step_name in enumerate(level):
+                steps[step_name]['name'] = step_name
+                steps[step_name]['number'] = number
+                if parallel:
+                    steps[step_name]['letter'] = chr(ord('a') + index)
+            num_traversed += len(level)
+
+            # steps with all dependencies traversed form the next level
+            next_level = []
+            for step_name in level:
+                for child in children[step_name]:
+                    dep_count[child] -= 1
+                    if not dep_count[child]:
+                        next_level.append(child)
+
+            level = next_level
             number += 1
 
+        if num_traversed < len(steps):
+            # steps remaining, but none have satisfied dependencies
+            Log.an().error('cycles found in graph')
+            return False
+
         return workflow_dict
 
 
     @classmethod
     def validate_workflow(cls, workflow_def):
         """Validate workflow definition."""
-        validator = cerberus.Validator(WORKFLOW_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(workflow_def)
+        cache_key = cls._cache_key('workflow', workflow_def)
+        valid_def = cls._cache_get(cache_key)
+        if valid_def is not None:
+            return valid_def
+
+        valid_def, errors = cls._validated(
+            'workflow', WORKFLOW_SCHEMA, workflow_def
+        )
 
         if not valid_def:
             Log.an().error(
                 'workflow validation error:\n%s',
-                pprint.pformat(validator.errors)
+                _LazyPretty(errors)
             )
             return False
 
-        numbered_def = cls.calculate_step_numbering(copy.deepcopy(valid_def))
+        # cerberus returns a new document, so it can be numbered in place
+        numbered_def = cls.calculate_step_numbering(valid_def)
         if not numbered_def:
             Log.an().error('invalid workflow step dependencies')
             return False
 
-        for step_name, step in valid_def['steps'].items():
-            step['name'] = step_name
+        cls._cache_put(cache_key, numbered_def)
 
         return numbered_def
 
@@ -571,16 +785,22 @@ class Definition:
     @classmethod
     def validate_job(cls, job_def):
         """Validate job definition."""
-        validator = cerberus.Validator(JOB_SCHEMA[GF_VERSION])
-        valid_def = validator.validated(job_def)
+        cache_key = cls._cache_key('job', job_def)
+        valid_def = cls._cache_get(cache_key)
+        if valid_def is not None:
+            return valid_def
+
+        valid_def, errors = cls._validated('job', JOB_SCHEMA, job_def)
 
         if not valid_def:
             Log.an().error(
                 'job validation error: \n%s',
-                pprint.pformat(validator.errors)
+                _LazyPretty(errors)
             )
             return False
 
+        cls._cache_put(cache_key, valid_def)
+
         return valid_def
 
 
@@ -588,6 +808,9 @@ class Definition:
         """
         Validate and add app to list.
 
+        Adding a app identical to one that was already added succeeds
+        without validating it again.
+
         Args:
             app_def: dict of app definition.
 
@@ -596,9 +819,14 @@ class Definition:
             On failure: False.
 
         """
+        fingerprint = self._cache_key('app', app_def)
+        if fingerprint is not None and fingerprint in self._fingerprints:
+            # identical app already added
+            return True
+
         valid_def = self.validate_app(app_def)
         if not valid_def:
-            Log.an().error('invalid app:\n%s', yaml.dump(app_def))
+            Log.an().error('invalid app:\n%s', LazyYaml(app_def))
             return False
 
         if valid_def['name'] in self._apps:
@@ -606,6 +834,8 @@ class Definition:
             return False
 
         self._apps[valid_def['name']] = valid_def
+        if fingerprint is not None:
+            self._fingerprints.add(fingerprint)
 
         return True
 
@@ -614,6 +844,9 @@ class Definition:
         """
         Validate and add workflow to list.
 
+        Adding a workflow identical to one that was already added succeeds
+        without validating it again.
+
         Args:
             workflow_def: dict of workflow definition.
 
@@ -622,9 +855,14 @@ class Definition:
             On failure: False.
 
         """
+        fingerprint = self._cache_key('workflow', workflow_def)
+        if fingerprint is not None and fingerprint in self._fingerprints:
+            # identical workflow already added
+            return True
+
         valid_def = self.validate_workflow(workflow_def)
         if not valid_def:
-            Log.an().error('invalid workflow:\n%s', yaml.dump(workflow_def))
+            Log.an().error('invalid workflow:\n%s', LazyYaml(workflow_def))
             return False
 
         if valid_def['name'] in self._workflows:
@@ -632,6 +870,8 @@ class Definition:
             return False
 
         self._workflows[valid_def['name']] = valid_def
+        if fingerprint is not None:
+            self._fingerprints.add(fingerprint)
 
         return True
 
@@ -640,6 +880,9 @@ class Definition:
         """
         Validate and add job to list.
 
+        Adding a job identical to one that was already added succeeds
+        without validating it again.
+
         Args:
             job_def: dict of job definition.
 
@@ -648,9 +891,14 @@ class Definition:
             On failure: False.
 
         """
+        fingerprint = self._cache_key('job', job_def)
+        if fingerprint is not None and fingerprint in self._fingerprints:
+            # identical job already added
+            return True
+
         valid_def = self.validate_job(job_def)
         if not valid_def:
-            Log.an().error('invalid job:\n%s', yaml.dump(job_def))
+            Log.an().error('invalid job:\n%s', LazyYaml(job_def))
             return False
 
         if valid_def['name'] in self._jobs:
@@ -658,6 +906,8 @@ class Definition:
             return False
 
         self._jobs[valid_def['name']] = valid_def
+        if fingerprint is not None:
+            self._fingerprints.add(fingerprint)
 
         return True
 
@@ -5,18 +5,40 @@ This module contains the GeneFlow Environment class, which sets up the
 environment for running GeneFlow from the CLI.
 """
 
+import functools
 import os
-from uuid import uuid1
-from pathlib import Path
+from uuid import uuid4
+from pathlib import Path, PurePath
+import shutil
 import sqlite3
-import unittest
 
 from geneflow.log import Log
 from geneflow.uri_parser import URIParser
-from geneflow.data_manager import DataManager
 from geneflow import GF_PACKAGE_PATH
 
 
+SQLITE_SQL_PATH = str(GF_PACKAGE_PATH / Path('data/sql/geneflow-sqlite.sql'))
+
+# empty db created from SQLITE_SQL_PATH when the package is built
+SQLITE_DB_PATH = str(GF_PACKAGE_PATH / Path('data/sql/geneflow-sqlite.db'))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_sqlite_sql():
+    """
+    Load the SQLite schema SQL, which is read only once per process.
+
+    Args:
+        None.
+
+    Returns:
+        String of SQL statements.
+
+    """
+    with open(SQLITE_SQL_PATH, 'r') as sql_file:
+        return sql_file.read()
+
+
 class Environment:
     """
     GeneFlow Environment Class.
@@ -47,32 +69,56 @@ class Environment:
         Output:
             Environment class object.
 
+        Raises:
+            TypeError: if user_home, geneflow_base, or session_id is not a
+                string (or path, for the directories).
+
         """
-        # user home directory (or some other directory)
-        self._user_home = user_home
+        # validate types once, so paths can be derived without error checks
+        for name, value in [
+                ('user_home', user_home), ('geneflow_base', geneflow_base)
+        ]:
+            if not isinstance(value, (str, PurePath)):
+                raise TypeError(
+                    'invalid {}, must be a string or path: {}'.format(
+                        name, value
+                    )
+                )
+        if session_id is not None and not isinstance(session_id, str):
+            raise TypeError(
+                'invalid session_id, must be a string: {}'.format(session_id)
+            )
+
+        # user home directory (or some other directory), left as is if it
+        #   cannot be expanded
+        self._user_home = os.path.expanduser(str(user_home))
         # geneflow base directory appended to user home
-        self._geneflow_base = geneflow_base
+        self._geneflow_base = str(geneflow_base)
         # session id, randomly generated if not provided
-        self._session_id = session_id
+        self._session_id = session_id if session_id else uuid4().hex
         # path to workflow definition, which should be in the
         #   same folder as all apps that the workflow references
         self._workflow_path = workflow_path
 
-        # working directories
-        self._gf_home = None
-        self._gf_tmp = None
-        self._gf_log = None
-        self._gf_work = None
+        # working directories, which are created by initialize()
+        self._gf_home = os.path.join(self._user_home, self._geneflow_base)
+        self._gf_tmp = os.path.join(self._gf_home, 'tmp')
+        self._gf_log = os.path.join(self._gf_home, 'log')
+        self._gf_work = os.path.join(self._gf_home, 'work')
 
         # config and db files
-        self._config_path = None
-        self._sqlite_db_path = None
+        session_path = os.path.join(self._gf_tmp, self._session_id)
+        self._config_path = session_path+'.yaml'
+        self._sqlite_db_path = session_path+'.db'
 
 
     def initialize(self):
         """
         Initialize environment.
 
+        All paths are set in __init__, so this only creates directories and
+        files.
+
         Args:
             None.
 
@@ -81,8 +127,8 @@ class Environment:
             On failure: False.
 
         """
-        if not self._init_user_home():
-            Log.an().error('cannot initialize user home directory')
+        if self._user_home == '~':
+            Log.an().error('cannot expand user home')
             return False
 
         if not self._init_dirs():
@@ -91,10 +137,6 @@ class Environment:
             )
             return False
 
-        if not self._init_session():
-            Log.an().error('cannot initialize geneflow session')
-            return False
-
         if not self.init_sqlite_db(self._sqlite_db_path):
             Log.an().error('cannot initialize sqlite db')
             return False
@@ -106,33 +148,6 @@ class Environment:
         return True
 
 
-    def _init_user_home(self):
-        """
-        Initialize user home directory.
-
-        Args:
-            None.
-
-        Returns:
-            On success: True.
-            On failure: False.
-
-        """
-        try:
-            self._user_home = str(Path(self._user_home).expanduser())
-        except TypeError as err:
-            Log.an().error(
-                'invalid user home: %s [%s]', self._user_home, str(err)
-            )
-            return False
-
-        if self._user_home == '~':
-            Log.an().error('cannot expand user home')
-            return False
-
-        return True
-
-
     def _init_dirs(self):
         """
         Create .geneflow/tmp, .geneflow/log, and .geneflow/work directories.
@@ -145,24 +160,10 @@ class Environment:
             On failure: False.
 
         """
-        try:
-            self._gf_home = str(Path(self._user_home)/self._geneflow_base)
-            self._gf_tmp = str(Path(self._gf_home)/'tmp')
-            self._gf_log = str(Path(self._gf_home)/'log')
-            self._gf_work = str(Path(self._gf_home)/'work')
-        except TypeError as err:
-            Log.an().error(
-                'invalid geneflow home (%s) or user home (%s) [%s]',
-                self._gf_home, self._user_home, str(err)
-            )
-            return False
-
-        for directory in [
-                self._gf_home, self._gf_tmp, self._gf_log, self._gf_work
-        ]:
+        # geneflow home is created along with its sub-directories
+        for directory in [self._gf_tmp, self._gf_log, self._gf_work]:
             try:
-                if not Path(directory).is_dir():
-                    Path(directory).mkdir()
+                Path(directory).mkdir(parents=True, exist_ok=True)
 
             except OSError as err:
                 Log.an().error(
@@ -173,35 +174,6 @@ class Environment:
         return True
 
 
-    def _init_session(self):
-        """
-        Set session id, sqlite db path, and config path.
-
-        Args:
-            None.
-
-        Returns:
-            On success: True.
-            On failure: False.
-
-        """
-        if not self._session_id:
-            self._session_id = str(uuid1())
-
-        try:
-            self._sqlite_db_path\
-                = str(Path(self._gf_tmp)/self._session_id)+'.db'
-            self._config_path\
-                = str(Path(self._gf_tmp)/self._session_id)+'.yaml'
-        except TypeError as err:
-            Log.an().error(
-                'invalid geneflow tmp path: %s [%s]', self._gf_tmp, str(err)
-            )
-            return False
-
-        return True
-
-
     @staticmethod
     def init_sqlite_db(sqlite_db_path):
         """
@@ -215,13 +187,23 @@ class Environment:
             On failure: False.
 
         """
-        sqlite_sql_path = str(
-            GF_PACKAGE_PATH / Path('data/sql/geneflow-sqlite.sql')
-        )
-
-        # create database
+        # copy the prebuilt empty db, unless the schema has been changed
+        # since it was built
         try:
-            dbh = sqlite3.connect(sqlite_db_path)
+            if (
+                    os.stat(SQLITE_DB_PATH).st_mtime
+                    >= os.stat(SQLITE_SQL_PATH).st_mtime
+            ):
+                shutil.copyfile(SQLITE_DB_PATH, sqlite_db_path)
+                return True
+
+        except OSError:
+            # fall back to creating the db from the schema
+            pass
+
+        # create database, transactions are managed explicitly
+        try:
+            dbh = sqlite3.connect(sqlite_db_path, isolation_level=None)
 
         except sqlite3.Error as err:
             Log.an().error(
@@ -229,31 +211,28 @@ class Environment:
             )
             return False
 
-        # initialize db structure
+        # initialize db structure in a single transaction, so the file is
+        # only synced once rather than after every statement
         try:
-            cursor = dbh.cursor()
-            with open(sqlite_sql_path, 'r') as sql_file:
-                query = sql_file.read()
-                cursor.executescript(query)
-                sql_file.close()
-            dbh.commit()
+            query = _load_sqlite_sql()
+            dbh.execute('PRAGMA synchronous=NORMAL')
+            dbh.executescript('BEGIN;\n{}\nCOMMIT;'.format(query))
 
         except sqlite3.Error as err:
             Log.an().error(
                 'cannot create sqlite db: %s [%s]', sqlite_db_path, str(err)
             )
-            dbh.close()
             return False
 
         except FileNotFoundError as err:
             Log.an().error(
                 'cannot load geneflow sql file: %s [%s]',
-                sqlite_sql_path, str(err)
+                SQLITE_SQL_PATH, str(err)
             )
-            dbh.close()
             return False
 
-        dbh.close()
+        finally:
+            dbh.close()
 
         return True
 
@@ -278,33 +257,48 @@ class Environment:
             Log.an().error('invalid workflow path: %s', self._workflow_path)
             return False
 
-        apps_uri = ('{}{}' if parsed_uri['folder'] == '/' else '{}/{}')\
-            .format(parsed_uri['folder'], 'apps')
-        parsed_apps_uri = URIParser.parse(
-            ('{}{}' if parsed_uri['folder'] == '/' else '{}/{}')\
-            .format(parsed_uri['folder'], 'apps')
-        )
-        if not parsed_apps_uri:
-            Log.an().error('cannot construct apps uri: %s', apps_uri)
-            return False
+        # the apps folder is next to the workflow definition, and is always a
+        # local path, so there is no need to parse it again
+        apps_path = parsed_uri['folder'].rstrip('/') + '/apps'
 
-        if not DataManager.exists(parsed_uri=parsed_apps_uri):
+        # directory entries carry their type, so only symlinks need a stat
+        # to find app directories
+        try:
+            app_dirs = [
+                entry.name
+                for entry in os.scandir(apps_path)
+                if not entry.name.startswith('.') and entry.is_dir()
+            ]
+
+        except (FileNotFoundError, NotADirectoryError):
             # no apps directory
             return True
 
-        for app_dir in DataManager.list(parsed_uri=parsed_apps_uri):
-            try:
-                os.environ['PATH'] = '{}{}{}'.format(
-                    os.path.join(
-                        parsed_apps_uri['chopped_path'], app_dir, 'assets'
-                    ),
-                    os.pathsep,
-                    os.environ['PATH']
-                )
+        except OSError as err:
+            Log.an().error(
+                'cannot list apps path: %s [%s]', apps_path, str(err)
+            )
+            return False
 
-            except OSError as err:
-                Log.an().error('workflow app pathmunge error [%s]', str(err))
-                return False
+        # prepend all app paths at once, the last listed app first
+        app_paths = [
+            os.path.join(apps_path, app_dir, 'assets')
+            for app_dir in reversed(app_dirs)
+        ]
+        if not app_paths:
+            return True
+
+        # read the current PATH once, it may also be unset
+        current_path = os.environ.get('PATH')
+        if current_path:
+            app_paths.append(current_path)
+
+        try:
+            os.environ['PATH'] = os.pathsep.join(app_paths)
+
+        except OSError as err:
+            Log.an().error('workflow app pathmunge error [%s]', str(err))
+            return False
 
         return True
 
@@ -353,12 +347,15 @@ class Environment:
 
 
 if __name__ == '__main__':
+    # only needed when run directly, not when imported by the CLI
+    from pprint import pprint
+    import unittest
+
     class TestEnvironment(unittest.TestCase):
         """Unittest."""
 
         def test_env(self):
             """Test environment class."""
-            from pprint import pprint
             env = Environment(
                 workflow_path='/sub/in/absolute/workflow/path'
             )
@@ -1,8 +1,11 @@
 """This module contains the GeneFlow AgaveStep class."""
 
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 import pprint
 import regex as re
+from requests.adapters import DEFAULT_POOLSIZE
 from slugify import slugify
 import urllib.parse
 
@@ -12,6 +15,24 @@ from geneflow.workflow_step import WorkflowStep
 from geneflow.extend.agave_wrapper import AgaveWrapper
 
 
+# maximum number of concurrent agave API calls for a step, agavepy sends
+# all calls through one requests session, which keeps this many connections
+# alive per host, so concurrent calls don't open new connections
+_MAX_WORKERS = DEFAULT_POOLSIZE
+
+# hpc job id in the description of a QUEUED agave job history item
+_HPC_JOB_RE = re.compile(r'^HPC.*local job (\d+)$')
+
+# agave log file name, gf-{}-{}-{}.out or .err
+_GF_LOG_RE = re.compile(r'^gf-\d+-.*\.(?:out|err)\Z')
+
+# agave job statuses that are retried
+_RETRY_STATUSES = frozenset({'FAILED', 'STOPPED'})
+
+# agave job statuses after which the hpc job id is no longer looked up
+_TERMINAL_STATUSES = frozenset({'FINISHED', 'FAILED', 'STOPPED', 'UNKNOWN'})
+
+
 class AgaveStep(WorkflowStep):
     """
     A class that represents Agave Workflow step objects. Inherits from the..
@@ -66,6 +87,9 @@ class AgaveStep(WorkflowStep):
         # agave context data
         self._agave = agave
 
+        # slugified step name, used in the name of every agave job
+        self._step_name_slug = slugify(self._step['name'])
+
 
     def initialize(self):
         """
@@ -130,53 +154,47 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
+        data_uri = self._parsed_data_uris[self._source_context]
+
         # make sure the source data URI has a compatible scheme (agave)
-        if self._parsed_data_uris[self._source_context]['scheme'] != 'agave':
+        if data_uri['scheme'] != 'agave':
             msg = 'invalid data uri scheme for this step: {}'.format(
-                self._parsed_data_uris[self._source_context]['scheme']
+                data_uri['scheme']
             )
             Log.an().error(msg)
             return self._fatal(msg)
 
         # delete folder if it already exists and clean==True
-        if (
-                DataManager.exists(
-                    parsed_uri=self._parsed_data_uris[self._source_context],
-                    agave=self._agave
-                )
-                and self._clean
-        ):
-            if not DataManager.delete(
-                    parsed_uri=self._parsed_data_uris[self._source_context],
-                    agave=self._agave
+        if self._clean:
+            if not self._agave['agave_wrapper'].files_delete_if_exists(
+                    data_uri['authority'],
+                    data_uri['chopped_path']
             ):
                 Log.a().warning(
                     'cannot delete existing data uri: %s',
-                    self._parsed_data_uris[self._source_context]['chopped_uri']
+                    data_uri['chopped_uri']
                 )
 
         # create folder
         if not DataManager.mkdir(
-                parsed_uri=self._parsed_data_uris[self._source_context],
+                parsed_uri=data_uri,
                 recursive=True,
                 agave=self._agave
         ):
             msg = 'cannot create data uri: {}'.format(
-                self._parsed_data_uris[self._source_context]['chopped_uri']
+                data_uri['chopped_uri']
             )
             Log.an().error(msg)
             return self._fatal(msg)
 
-        # create _log folder
+        # create _log folder, its parent was just created so there is no
+        # need to check for it again
         if not DataManager.mkdir(
-                uri='{}/_log'.format(
-                    self._parsed_data_uris[self._source_context]['chopped_uri']
-                ),
-                recursive=True,
+                uri=data_uri['chopped_uri']+'/_log',
                 agave=self._agave
         ):
             msg = 'cannot create _log folder in data uri: {}/_log'.format(
-                self._parsed_data_uris[self._source_context]['chopped_uri']
+                data_uri['chopped_uri']
             )
             Log.an().error(msg)
             return self._fatal(msg)
@@ -218,36 +236,27 @@ class AgaveStep(WorkflowStep):
         return file_list
 
 
-    def _run_map(self, map_item):
+    def _prepare_map(self, map_item):
         """
-        Run a job for each map item and store the job ID.
+        Construct the agave app template of a map item job.
 
         Args:
             self: class instance.
             map_item: map item object (item of self._map)
 
         Returns:
-            On success: True.
-            On failure: False.
+            Agave app template dict.
 
         """
         # load default app inputs overwrite with template inputs
+        quote = urllib.parse.quote
+        template = map_item['template']
         inputs = {}
-        for input_key in self._app['inputs']:
-            if input_key in map_item['template']:
-                if map_item['template'][input_key]:
-                    # only include an input if the value is a non-empty string
-                    inputs[input_key] = urllib.parse.quote(
-                        str(map_item['template'][input_key]),
-                        safe='/:'
-                    )
-            else:
-                if self._app['inputs'][input_key]['default']:
-                    # only include an input if the value is a non-empty string
-                    inputs[input_key] = urllib.parse.quote(
-                        str(self._app['inputs'][input_key]['default']),
-                        safe='/:'
-                    )
+        for input_key, app_input in self._app['inputs'].items():
+            value = template.get(input_key, app_input['default'])
+            if value:
+                # only include an input if the value is a non-empty string
+                inputs[input_key] = quote(str(value), safe='/:')
 
         # load default app parameters, overwrite with template parameters
         parameters = {}
@@ -262,68 +271,125 @@ class AgaveStep(WorkflowStep):
         parameters['exec_method'] = self._step['execution']['method']
 
         # construct agave app template
+        archive_uri = self._agave['parsed_archive_uri']
         name = 'gf-{}-{}-{}'.format(
             str(map_item['attempt']),
-            slugify(self._step['name']),
+            self._step_name_slug,
             slugify(map_item['template']['output'])
         )
         name = name[:62]+'..' if len(name) > 64 else name
-        archive_path = '{}/{}'.format(
-            self._agave['parsed_archive_uri']['chopped_path'],
-            name
-        )
+        archive_path = archive_uri['chopped_path']+'/'+name
         app_template = {
             'name': name,
             'appId': self._app['definition']['agave']['agave_app_id'],
             'archive': True,
             'inputs': inputs,
             'parameters': parameters,
-            'archiveSystem': self._agave['parsed_archive_uri']['authority'],
+            'archiveSystem': archive_uri['authority'],
             'archivePath': archive_path
         }
-        Log.some().debug(
-            "agave app template:\n%s", pprint.pformat(app_template)
-        )
+        # only pretty-print the template if it will be logged
+        if Log.some().isEnabledFor(logging.DEBUG):
+            Log.some().debug(
+                "agave app template:\n%s", pprint.pformat(app_template)
+            )
+
+        return app_template
 
+
+    def _submit_map(self, app_template):
+        """
+        Submit the agave job of a map item.
+
+        The step status is not changed, so this can be called from multiple
+        threads at once.
+
+        Args:
+            self: class instance.
+            app_template: agave app template from _prepare_map().
+
+        Returns:
+            On success: agave job dict.
+            On failure: False.
+
+        """
         # delete archive path if it exists
-        if DataManager.exists(
-                uri=self._agave['parsed_archive_uri']['chopped_uri']+'/'+name,
-                agave=self._agave
+        if not self._agave['agave_wrapper'].files_delete_if_exists(
+                app_template['archiveSystem'],
+                app_template['archivePath']
         ):
-            if not DataManager.delete(
-                    uri=self._agave['parsed_archive_uri']['chopped_uri']+'/'+name,
-                    agave=self._agave
-            ):
-                Log.a().warning(
-                    'cannot delete archive uri: %s/%s',
-                    self._agave['parsed_archive_uri']['chopped_uri'],
-                    name
-                )
+            Log.a().warning(
+                'cannot delete archive uri: %s/%s',
+                self._agave['parsed_archive_uri']['chopped_uri'],
+                app_template['name']
+            )
 
         # submit job
         job = self._agave['agave_wrapper'].jobs_submit(app_template)
         if not job:
-            msg = 'agave jobs submit failed for "{}"'.format(
-                app_template['name']
+            Log.an().error(
+                'agave jobs submit failed for "%s"', app_template['name']
             )
-            Log.an().error(msg)
-            return self._fatal(msg)
+            return False
 
+        return job
+
+
+    def _record_map(self, map_item, app_template, job):
+        """
+        Record the submitted agave job of a map item.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map)
+            app_template: agave app template from _prepare_map().
+            job: agave job dict from _submit_map().
+
+        Returns:
+            None.
+
+        """
         # log agave job id
         Log.some().debug('agave job id: %s -> %s', map_item['template']['output'], job['id'])
 
         # record job info
-        map_item['run'][map_item['attempt']]['agave_job_id'] = job['id']
-        map_item['run'][map_item['attempt']]['archive_uri'] = '{}/{}'\
-            .format(
-                self._agave['parsed_archive_uri']['chopped_uri'],
-                name
-            )
-        map_item['run'][map_item['attempt']]['hpc_job_id'] = ''
+        run = map_item['run'][map_item['attempt']]
+        run['agave_job_id'] = job['id']
+        run['archive_uri'] = (
+            self._agave['parsed_archive_uri']['chopped_uri']
+            +'/'+app_template['name']
+        )
+        run['hpc_job_id'] = ''
 
         # set status of process
         map_item['status'] = 'PENDING'
-        map_item['run'][map_item['attempt']]['status'] = 'PENDING'
+        run['status'] = 'PENDING'
+
+
+    def _run_map(self, map_item):
+        """
+        Run a job for each map item and store the job ID.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map)
+
+        Returns:
+            On success: True.
+            On failure: False.
+
+        """
+        app_template = self._prepare_map(map_item)
+
+        job = self._submit_map(app_template)
+        if not job:
+            msg = 'agave jobs submit failed for "{}"'.format(
+                app_template['name']
+            )
+            Log.an().error(msg)
+            return self._fatal(msg)
+
+        self._record_map(map_item, app_template, job)
 
         return True
 
@@ -332,7 +398,9 @@ class AgaveStep(WorkflowStep):
         """
         Execute agave job for each of the map items.
 
-        Store job IDs in run detail.
+        Store job IDs in run detail. All app templates are constructed first,
+        and then the jobs are submitted concurrently, so submitting a step
+        costs about one agave API round-trip rather than one per map item.
 
         Args:
             self: class instance.
@@ -342,13 +410,29 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
-        for map_item in self._map:
+        app_templates = [self._prepare_map(map_item) for map_item in self._map]
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(_MAX_WORKERS, len(app_templates)))
+        ) as executor:
+            jobs = list(executor.map(self._submit_map, app_templates))
+
+        # record all submitted jobs before reporting any failure, so that
+        # they are in the run detail
+        failed_map_item = None
+        for map_item, app_template, job in zip(self._map, app_templates, jobs):
+            if not job:
+                if failed_map_item is None:
+                    failed_map_item = map_item
+                continue
 
-            if not self._run_map(map_item):
-                msg = 'cannot run agave job for map item "{}"'\
-                    .format(map_item['filename'])
-                Log.an().error(msg)
-                return self._fatal(msg)
+            self._record_map(map_item, app_template, job)
+
+        if failed_map_item is not None:
+            msg = 'cannot run agave job for map item "{}"'\
+                .format(failed_map_item['filename'])
+            Log.an().error(msg)
+            return self._fatal(msg)
 
         self._update_status_db('RUNNING', '')
 
@@ -369,69 +453,103 @@ class AgaveStep(WorkflowStep):
         return self._map
 
 
-    def check_running_jobs(self):
+    def _check_map(self, map_item):
         """
-        Check the status/progress of all map-reduce items..
+        Update the status and hpc job id of a map item.
 
-        And update _map status.
+        Only the map item is changed, so this can be called from multiple
+        threads at once.
 
         Args:
             self: class instance.
+            map_item: map item object (item of self._map)
 
         Returns:
-            True.
+            None.
 
         """
-        # check if jobs are still running
-        for map_item in self._map:
+        run = map_item['run'][map_item['attempt']]
 
-            map_item['status'] = self._agave['agave_wrapper'].jobs_get_status(
-                map_item['run'][map_item['attempt']]['agave_job_id']
-            )
+        map_item['status'] = self._agave['agave_wrapper'].jobs_get_status(
+            run['agave_job_id']
+        )
 
-            # for status failures, set to 'UNKNOWN'
-            if not map_item['status']:
-                msg = 'cannot get job status for step "{}"'\
-                    .format(self._step['name'])
-                Log.a().warning(msg)
-                map_item['status'] = 'UNKNOWN'
+        # for status failures, set to 'UNKNOWN'
+        if not map_item['status']:
+            msg = 'cannot get job status for step "{}"'\
+                .format(self._step['name'])
+            Log.a().warning(msg)
+            map_item['status'] = 'UNKNOWN'
+
+        # set status of run-attempt
+        run['status'] = map_item['status']
+
+        # check hpc job ids
+        if run['hpc_job_id']:
+            # already have it
+            return
+
+        if map_item['status'] in _TERMINAL_STATUSES:
+            # job is done, or its status is unavailable, so don't look up the
+            # history just for the hpc job id
+            return
+
+        # job id listed in history
+        response = self._agave['agave_wrapper'].jobs_get_history(
+            run['agave_job_id']
+        )
+
+        if not response:
+            msg = 'cannot get hpc job id for job: agave_job_id={}'.format(
+                run['agave_job_id']
+            )
+            Log.a().warning(msg)
+            return
 
-            # set status of run-attempt
-            map_item['run'][map_item['attempt']]['status'] = map_item['status']
+        for item in response:
+            # only QUEUED items that start with HPC can have the job id, so
+            # skip the rest without running the regex
+            if item['status'] != 'QUEUED':
+                continue
 
-            # check hpc job ids
-            if map_item['run'][map_item['attempt']]['hpc_job_id']:
-                # already have it
+            description = item['description']
+            if not description.startswith('HPC'):
                 continue
 
-            # job id listed in history
-            response = self._agave['agave_wrapper'].jobs_get_history(
-                map_item['run'][map_item['attempt']]['agave_job_id']
-            )
+            match = _HPC_JOB_RE.match(description)
+            if match:
+                run['hpc_job_id'] = match.group(1)
 
-            if not response:
-                msg = 'cannot get hpc job id for job: agave_job_id={}'.format(
-                    map_item['run'][map_item['attempt']]['agave_job_id']
+                # log hpc job id in
+                Log.some().debug(
+                    'hpc job id: %s -> %s', map_item['template']['output'],
+                    match.group(1)
                 )
-                Log.a().warning(msg)
-                continue
 
-            for item in response:
-                if item['status'] == 'QUEUED':
-                    match = re.match(
-                        r'^HPC.*local job (\d*)$', item['description']
-                    )
-                    if match:
-                        map_item['run'][map_item['attempt']]['hpc_job_id'] \
-                            = match.group(1)
-
-                        # log hpc job id in
-                        Log.some().debug(
-                            'hpc job id: %s -> %s', map_item['template']['output'],
-                            match.group(1)
-                        )
+                break
+
+
+    def check_running_jobs(self):
+        """
+        Check the status/progress of all map-reduce items..
 
-                        break
+        And update _map status. Map items are checked concurrently, so a
+        polling pass costs about one agave API round-trip rather than one per
+        map item.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            True.
+
+        """
+        # check if jobs are still running
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(_MAX_WORKERS, len(self._map)))
+        ) as executor:
+            # consume the results so that worker exceptions are raised
+            list(executor.map(self._check_map, self._map))
 
         self._update_status_db(self._status, '')
 
@@ -450,14 +568,13 @@ class AgaveStep(WorkflowStep):
             On failure: Error message.
 
         """
+        retry_limit = self._config['agave']['job_retry']
+
         # check if any jobs failed or stopped
         for map_item in self._map:
-            if (
-                    map_item['status'] == 'FAILED'
-                    or map_item['status'] == 'STOPPED'
-            ):
+            if map_item['status'] in _RETRY_STATUSES:
                 # retry the job, if not at limit
-                if map_item['attempt'] >= self._config['agave']['job_retry']:
+                if map_item['attempt'] >= retry_limit:
                     msg = (
                         'agave job failed ({}) for step "{}", '
                         'retries for map item "{}" reached limit of {}'
@@ -465,7 +582,7 @@ class AgaveStep(WorkflowStep):
                         map_item['run'][map_item['attempt']]['agave_job_id'],
                         self._step['name'],
                         map_item['filename'],
-                        self._config['agave']['job_retry']
+                        retry_limit
                     )
                     Log.an().error(msg)
                     return self._fatal(msg)
@@ -492,10 +609,50 @@ class AgaveStep(WorkflowStep):
         return True
 
 
+    def _list_map_logs(self, map_item):
+        """
+        List the agave log files and _log folder of a map item's archive.
+
+        Only the archive is read, so this can be called from multiple threads
+        at once.
+
+        Args:
+            self: class instance.
+            map_item: map item object (item of self._map)
+
+        Returns:
+            Tuple of the archive list and the _log folder list. The archive
+            list is False or empty on failure. The _log folder list is None if
+            there is no _log folder, and False or empty on failure.
+
+        """
+        archive_uri = map_item['run'][map_item['attempt']]['archive_uri']
+
+        # check for any agave log files (*.out and *.err files)
+        agave_log_list = DataManager.list(uri=archive_uri, agave=self._agave)
+        if not agave_log_list:
+            return (agave_log_list, None)
+
+        # the archive list already shows whether there is a _log directory
+        if '_log' not in agave_log_list:
+            return (agave_log_list, None)
+
+        # get list of all items in the _log directory
+        log_list = DataManager.list(
+            uri=archive_uri+'/_log',
+            agave=self._agave
+        )
+
+        return (agave_log_list, log_list)
+
+
     def clean_up(self):
         """
         Copy data from Agave archive location to step output location (data URI).
 
+        The archives of all map items are listed concurrently up front, and
+        then all files are imported concurrently.
+
         Args:
             self: class instance.
 
@@ -504,37 +661,41 @@ class AgaveStep(WorkflowStep):
             On failure: False.
 
         """
-        # destination _log directory, common for all map items
-        dest_log_dir = '{}/{}'.format(
-            self._parsed_data_uris[self._source_context]\
-                ['chopped_uri'],
-            '_log'
-        )
+        # step output location, and destination _log directory, common for
+        # all map items
+        data_uri = self._parsed_data_uris[self._source_context]
+        data_authority = data_uri['authority']
+        data_path = data_uri['chopped_path']
+        dest_log_path = data_path+'/_log'
+        dest_log_dir = data_uri['chopped_uri']+'/_log'
+
+        # list archives of all map items
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(_MAX_WORKERS, len(self._map)))
+        ) as executor:
+            map_log_lists = list(
+                executor.map(self._list_map_logs, self._map)
+            )
 
-        # copy data for each map item
-        for map_item in self._map:
+        # error message and import arguments for each file to copy
+        output_msg = 'agave import failed for step "{}"'.format(
+            self._step['name']
+        )
+        imports = []
+        copy_log_dir = False
+        for map_item, (agave_log_list, log_list) in zip(
+                self._map, map_log_lists
+        ):
+            archive_prefix \
+                = map_item['run'][map_item['attempt']]['archive_uri']+'/'
+            output = map_item['template']['output']
 
             # copy step output
-            if not self._agave['agave_wrapper'].files_import_from_agave(
-                    self._parsed_data_uris[self._source_context]['authority'],
-                    self._parsed_data_uris[self._source_context]\
-                        ['chopped_path'],
-                    map_item['template']['output'],
-                    '{}/{}'.format(
-                        map_item['run'][map_item['attempt']]['archive_uri'],
-                        map_item['template']['output']
-                    )
-            ):
-                msg = 'agave import failed for step "{}"'\
-                    .format(self._step['name'])
-                Log.an().error(msg)
-                return self._fatal(msg)
+            imports.append((
+                output_msg,
+                (data_authority, data_path, output, archive_prefix+output)
+            ))
 
-            # check for any agave log files (*.out and *.err files)
-            agave_log_list = DataManager.list(
-                uri=map_item['run'][map_item['attempt']]['archive_uri'],
-                agave=self._agave
-            )
             if not agave_log_list:
                 msg = 'cannot get agave log list for step "{}"'\
                     .format(self._step['name'])
@@ -543,82 +704,78 @@ class AgaveStep(WorkflowStep):
 
             # copy each agave log file, the pattern is gf-{}-{}-{}.out or .err
             for item in agave_log_list:
-                if re.match('^gf-\d*-.*\.(out|err)$', item):
-                    if not self._agave['agave_wrapper'].files_import_from_agave(
-                        self._parsed_data_uris[self._source_context]\
-                            ['authority'],
-                        '{}/{}'.format(
-                            self._parsed_data_uris[self._source_context]\
-                                ['chopped_path'],
-                            '_log'
-                        ),
-                        item,
-                        '{}/{}'.format(
-                            map_item['run'][map_item['attempt']]\
-                                ['archive_uri'],
-                            item
+                if _GF_LOG_RE.match(item):
+                    imports.append((
+                        'cannot copy agave log item "{}"'.format(item),
+                        (
+                            data_authority,
+                            dest_log_path,
+                            item,
+                            archive_prefix+item
                         )
-                    ):
-                        msg = 'cannot copy agave log item "{}"'.format(item)
-                        Log.an().error(msg)
-                        return self._fatal(msg)
-
-            # check if anything is in the _log directory
-            src_log_dir = '{}/{}'.format(
-                map_item['run'][map_item['attempt']]['archive_uri'],
-                '_log'
-            )
+                    ))
 
-            if DataManager.exists(
-                uri=src_log_dir,
+            if log_list is None:
+                # no _log directory
+                continue
+
+            if not log_list:
+                msg = 'cannot get _log list for step "{}"'\
+                    .format(self._step['name'])
+                Log.an().error(msg)
+                return self._fatal(msg)
+
+            # copy each list item
+            copy_log_dir = True
+            archive_log_prefix = archive_prefix+'_log/'
+            for item in log_list:
+                imports.append((
+                    'cannot copy log item "{}"'.format(item),
+                    (
+                        data_authority,
+                        dest_log_path,
+                        item,
+                        archive_log_prefix+item
+                    )
+                ))
+
+        # create dest _log dir if it doesn't exist
+        if copy_log_dir and not DataManager.exists(
+            uri=dest_log_dir,
+            agave=self._agave
+        ):
+            if not DataManager.mkdir(
+                uri=dest_log_dir,
                 agave=self._agave
             ):
-                # create dest _log dir if it doesn't exist
-                if not DataManager.exists(
-                    uri=dest_log_dir,
-                    agave=self._agave
-                ):
-                    if not DataManager.mkdir(
-                        uri=dest_log_dir,
-                        agave=self._agave
-                    ):
-                        msg = 'cannot create _log directory for step "{}"'\
-                            .format(self._step['name'])
-                        Log.an().error(msg)
-                        return self._fatal(msg)
-
-                # get list of all items in src_log_dir
-                log_list = DataManager.list(
-                    uri=src_log_dir,
-                    agave=self._agave
-                )
-                if not log_list:
-                    msg = 'cannot get _log list for step "{}"'\
-                        .format(self._step['name'])
-                    Log.an().error(msg)
-                    return self._fatal(msg)
+                msg = 'cannot create _log directory for step "{}"'\
+                    .format(self._step['name'])
+                Log.an().error(msg)
+                return self._fatal(msg)
 
-                # copy each list item
-                for item in log_list:
-                    if not self._agave['agave_wrapper'].files_import_from_agave(
-                        self._parsed_data_uris[self._source_context]\
-                            ['authority'],
-                        '{}/{}'.format(
-                            self._parsed_data_uris[self._source_context]\
-                                ['chopped_path'],
-                            '_log'
-                        ),
-                        item,
-                        '{}/{}/{}'.format(
-                            map_item['run'][map_item['attempt']]\
-                                ['archive_uri'],
-                            '_log',
-                            item
-                        )
-                    ):
-                        msg = 'cannot copy log item "{}"'.format(item)
-                        Log.an().error(msg)
-                        return self._fatal(msg)
+        # copy all files, and stop at the first failure
+        msg = None
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(_MAX_WORKERS, len(imports)))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._agave['agave_wrapper'].files_import_from_agave,
+                    *import_args
+                ): import_msg
+                for import_msg, import_args in imports
+            }
+            for future in as_completed(futures):
+                if not future.result():
+                    msg = futures[future]
+                    # imports that haven't started are skipped
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        if msg:
+            Log.an().error(msg)
+            return self._fatal(msg)
 
         self._update_status_db('FINISHED', '')
 
@@ -1,6 +1,7 @@
 """This module contains the GeneFlow AgaveWrapper class."""
 
 import os
+import threading
 import time
 import urllib.parse
 
@@ -77,6 +78,8 @@ class AgaveWrapper:
                         num_tries < retry
                         and num_token_tries < that._config['token_retry']
                 ):
+                    # token refreshes seen before this attempt
+                    token_refreshes = that._token_refreshes
                     try:
                         try:
                             result = func(that, *args, **kwargs)
@@ -95,44 +98,14 @@ class AgaveWrapper:
                                 # because token was refreshed in a different
                                 # thread/process
 
-                                # create new token
-                                if that._config['connection_type']\
-                                        == 'impersonate':
-                                    # re-init object without losing object
-                                    # binding
-                                    that._agave.__init__(
-                                        api_server=that._config['server'],
-                                        username=that._config['username'],
-                                        password=that._config['password'],
-                                        token_username=that._config[
-                                            'token_username'
-                                        ],
-                                        client_name=that._config['client'],
-                                        api_key=that._config['key'],
-                                        api_secret=that._config['secret'],
-                                        verify=False
-                                    )
-
-                                elif that._config['connection_type']\
-                                        == 'agave-cli':
-                                    # get updated credentials from
-                                    # ~/.agave/current
-                                    agave_clients = Agave._read_clients()
-                                    # don't verify ssl
-                                    agave_clients[0]['verify'] = False
-                                    # re-init object without losing object
-                                    # binding
-                                    that._agave.__init__(**agave_clients[0])
-
-                                else:
-                                    # shouldn't reach this condition, but raise
-                                    # exception just in case
-                                    raise Exception(
-                                        'invalid agave connection type: {}'\
-                                            .format(
-                                                that._config['connection_type']
-                                            )
-                                    )
+                                # threads share the agave client, so only
+                                # one of them re-inits it, and not again if
+                                # another thread already refreshed the token
+                                with that._token_lock:
+                                    if token_refreshes \
+                                            == that._token_refreshes:
+                                        that._refresh_token()
+                                        that._token_refreshes += 1
 
                             if str(err).startswith('404'):
                                 if not self._silent_404:
@@ -174,6 +147,10 @@ class AgaveWrapper:
         self._config = config
         self._agave = agave
 
+        # serialize token refreshes of the shared agave client
+        self._token_lock = threading.Lock()
+        self._token_refreshes = 0
+
         if token_username:
             self._config['token_username'] = token_username
 
@@ -215,6 +192,51 @@ class AgaveWrapper:
         return True
 
 
+    def _refresh_token(self):
+        """
+        Create a new token for the agave client.
+
+        The client is re-initialized in place, so objects bound to it keep
+        working.
+
+        Args:
+            self: class instance.
+
+        Returns:
+            None.
+
+        """
+        if self._config['connection_type'] == 'impersonate':
+            # re-init object without losing object binding
+            self._agave.__init__(
+                api_server=self._config['server'],
+                username=self._config['username'],
+                password=self._config['password'],
+                token_username=self._config['token_username'],
+                client_name=self._config['client'],
+                api_key=self._config['key'],
+                api_secret=self._config['secret'],
+                verify=False
+            )
+
+        elif self._config['connection_type'] == 'agave-cli':
+            # get updated credentials from ~/.agave/current
+            agave_clients = Agave._read_clients()
+            # don't verify ssl
+            agave_clients[0]['verify'] = False
+            # re-init object without losing object binding
+            self._agave.__init__(**agave_clients[0])
+
+        else:
+            # shouldn't reach this condition, but raise exception just in
+            # case
+            raise Exception(
+                'invalid agave connection type: {}'.format(
+                    self._config['connection_type']
+                )
+            )
+
+
     @AgaveRetry('files_list', silent_404=True)
     def files_exist(self, system_id, file_path):
         """
@@ -391,6 +413,40 @@ class AgaveWrapper:
         return True
 
 
+    @AgaveRetry('files_delete')
+    def files_delete_if_exists(self, system_id, file_path):
+        """
+        Wrap AgavePy file delete command, if the file may not exist.
+
+        Deleting a missing file is not an error, so there is no need to
+        check whether it exists first.
+
+        Args:
+            self: class instance.
+            system_id: Identifier for Agave storage system.
+            file_path: Path for file to be deleted.
+
+        Returns:
+            On success, or if the file doesn't exist: True with no exceptions.
+            On failure: Throws exception.
+
+        """
+        try:
+            self._agave.files.delete(
+                systemId=system_id,
+                filePath=file_path
+            )
+
+        except Exception as err:
+            if str(err).startswith('404'):
+                # nothing to delete
+                return True
+
+            raise err
+
+        return True
+
+
     @AgaveRetry('files_mkdir')
     def files_mkdir(self, system_id, file_path, dir_name):
         """
@@ -3,6 +3,14 @@
 import logging
 import sys
 
+import yaml
+
+# use the libyaml emitter if PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 
 class Log:
     """Log events while running GeneFlow workflows."""
@@ -115,3 +123,24 @@ class Log:
 
         """
         return cls.LOGLEVEL_REV.get(cls.logger.level, 'info')
+
+
+class LazyYaml:
+    """
+    Defer YAML serialization of a log argument until it's formatted.
+
+    Logging only calls str() on arguments of records that are emitted, so
+    definitions are not dumped if the record is filtered out.
+    """
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        """Wrap object to serialize."""
+        self.obj = obj
+
+    def __str__(self):
+        """Serialize wrapped object to YAML."""
+        return yaml.dump(
+            self.obj, Dumper=SafeDumper, default_flow_style=None
+        )
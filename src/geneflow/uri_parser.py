@@ -1,10 +1,23 @@
 """This module contains the GeneFlow URIParser class."""
 
 # import system modules
+from collections import namedtuple
+import functools
 import re
 # import custom modules
 from geneflow.log import Log
 
+
+# immutable record of URI components, used to cache parse results
+ParsedURI = namedtuple(
+    'ParsedURI',
+    [
+        'uri', 'chopped_uri', 'scheme', 'authority',
+        'path', 'chopped_path', 'folder', 'name'
+    ]
+)
+
+
 class URIParser:
     r"""
     Light-weight URI parser adhering to part of RFC 3986.
@@ -85,7 +98,135 @@ class URIParser:
             On failure: False.
 
         """
-        matched = re.match(cls.uri_regex, str(uri))
+        parsed_uri = cls._parse(str(uri))
+        if not parsed_uri:
+            return False
+
+        # _asdict() returns a new dict, so callers can't modify the cached
+        # result
+        parsed_uri = parsed_uri._asdict()
+        parsed_uri['uri'] = uri # original URI
+
+        return parsed_uri
+
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse(cls, uri):
+        """
+        Parse a URI string, results are cached for repeated URIs.
+
+        Args:
+            uri: A generic URI string.
+
+        Returns:
+            On success: A ParsedURI of URI components, see parse().
+            On failure: False.
+
+        """
+        if '\n' in uri:
+            # only the regexes define how line breaks are handled
+            components = cls._split_regex(uri)
+        else:
+            components = cls._split(uri)
+
+        if not components:
+            return False
+
+        scheme, authority, path, folder, name = components
+
+        # "normalized" path without extra slashes
+        chopped_path = (
+            folder+name if folder == '/' or folder == '' else folder+'/'+name
+        ) if name else folder
+
+        # "normalized" URI without extra slashes and with scheme
+        chopped_uri = '{}{}{}'.format(
+            '{}:'.format(scheme),
+            ('//{}'.format(authority) if authority else ''),
+            chopped_path
+        )
+
+        return ParsedURI(
+            uri=uri,
+            chopped_uri=chopped_uri,
+            scheme=scheme,
+            authority=authority,
+            path=path,
+            chopped_path=chopped_path,
+            folder=folder,
+            name=name
+        )
+
+
+    @staticmethod
+    def _split(uri):
+        """
+        Split a single-line URI into components with string operations.
+
+        Equivalent to _split_regex, but avoids the regex engine.
+
+        Args:
+            uri: A generic URI string without line breaks.
+
+        Returns:
+            Tuple of (scheme, authority, path, folder, name).
+
+        """
+        # scheme is the part before the first colon, unless a slash comes
+        # first, e.g., local, agave, http, etc.
+        colon = uri.find(':')
+        slash = uri.find('/')
+        if colon > 0 and (slash == -1 or colon < slash):
+            scheme = uri[:colon]
+            rest = uri[colon+1:]
+        else:
+            scheme = 'local'
+            rest = uri
+
+        # authority can be '' (e.g., server, or storage system)
+        authority = ''
+        if rest.startswith('//'):
+            slash = rest.find('/', 2)
+            if slash == -1:
+                authority = rest[2:]
+                rest = ''
+            else:
+                authority = rest[2:slash]
+                rest = rest[slash:]
+
+        path = rest if rest else '/'
+
+        # replace one or more consecutive slashes with single slash
+        while '//' in path:
+            path = path.replace('//', '/')
+
+        # get folder and name from path
+        if path.endswith('/'):
+            folder = path[:-1] if len(path) > 1 else path
+            name = ''
+        else:
+            slash = path.rfind('/')
+            folder = path[:slash] if slash > 0 else path[:slash+1]
+            name = path[slash+1:]
+
+        return (scheme, authority, path, folder, name)
+
+
+    @classmethod
+    def _split_regex(cls, uri):
+        """
+        Split a URI into components with the URI and path regexes.
+
+        Args:
+            uri: A generic URI string.
+
+        Returns:
+            On success: Tuple of (scheme, authority, path, folder, name).
+            On failure: False.
+
+        """
+        matched = re.match(cls.uri_regex, uri)
         if not matched:
             Log.a().debug('invalid uri: %s', uri)
             return False
@@ -111,28 +252,39 @@ class URIParser:
         folder = matched.group(1) if matched.group(1) else matched.group(2)
         name = matched.group(3) if matched.group(3) else ''
 
-        # "normalized" path without extra slashes
-        chopped_path = (
-            folder+name if folder == '/' or folder == '' else folder+'/'+name
-        ) if name else folder
+        return (scheme, authority, path, folder, name)
 
-        # "normalized" URI without extra slashes and with scheme
-        chopped_uri = '{}{}{}'.format(
-            '{}:'.format(scheme),
-            ('//{}'.format(authority) if authority else ''),
-            chopped_path
-        )
 
-        return {
-            'uri': uri, # original URI
-            'chopped_uri': chopped_uri,
-            'scheme': scheme,
-            'authority': authority,
-            'path': path,
-            'chopped_path': chopped_path,
-            'folder': folder,
-            'name': name
-        }
+    @classmethod
+    def chop(cls, parsed_uri):
+        """
+        Get the parsed form of the chopped URI of an already parsed URI.
+
+        Equivalent to cls.parse(parsed_uri['chopped_uri']), but reuses the
+        components of parsed_uri instead of parsing the URI again. Only the
+        folder and name need to be recomputed, and only if the path ends with
+        a slash.
+
+        Args:
+            parsed_uri: URI dict returned by parse().
+
+        Returns:
+            A dict of the same form returned by parse().
+
+        """
+        chopped_uri = dict(parsed_uri)
+        chopped_uri['uri'] = parsed_uri['chopped_uri']
+        chopped_uri['path'] = parsed_uri['chopped_path']
+
+        if not parsed_uri['name']:
+            # chopped path ends at the folder, so split it again
+            matched = re.match(cls.path_regex, parsed_uri['chopped_path'])
+            chopped_uri['folder'] = (
+                matched.group(1) if matched.group(1) else matched.group(2)
+            )
+            chopped_uri['name'] = matched.group(3) if matched.group(3) else ''
+
+        return chopped_uri
 
 
     @classmethod
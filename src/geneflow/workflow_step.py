@@ -85,6 +85,9 @@ class WorkflowStep(StageableData):
 
         # step status
         self._status = 'PENDING'
+        # status, message, and detail of the last status written to the
+        # database
+        self._last_written_status = None
 
         # workflow-level inputs and parameters
         self._inputs = inputs
@@ -610,6 +613,13 @@ class WorkflowStep(StageableData):
             On failure: False.
 
         """
+        detail = json.dumps(self._serialize_detail())
+
+        # skip the write if nothing changed since the last one, e.g., when
+        # polling jobs that are still running
+        if (status, msg, detail) == self._last_written_status:
+            return True
+
         try:
             data_source = DataSource(self._config['database'])
         except DataSourceException as err:
@@ -618,17 +628,18 @@ class WorkflowStep(StageableData):
             return False
 
         self._status = status
-        detail = self._serialize_detail()
 
         if not data_source.update_job_step_status(
                 self._step['step_id'],
                 self._job['job_id'],
                 self._status,
-                json.dumps(detail),
+                detail,
                 msg
         ):
             Log.an().warning('cannot update job status in data source')
             data_source.rollback()
+        else:
+            self._last_written_status = (status, msg, detail)
 
         data_source.commit()
         return True
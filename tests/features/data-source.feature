@@ -0,0 +1,34 @@
+Feature: Data Source
+  As a user, I want workflow imports to leave the database unchanged when they fail
+
+  Scenario: A failed workflow import doesn't commit workflows imported before the failure
+    Given The "app1" app has been imported
+    When I import workflows with the following steps
+        | workflow | app_name |
+        | wf1      | app1     |
+        | wf2      | missing  |
+    Then The workflow import fails
+    And The "wf1" workflow is not in the database
+
+  Scenario: Re-importing an identical workflow returns the existing workflow
+    Given The "app1" app has been imported
+    And The "wf1" workflow has been imported with the "app1" app
+    When I import the "wf1" workflow with the "app1" app again
+    Then The same workflow is returned
+    And The database has 1 "wf1" workflow records
+
+  Scenario: Re-importing a workflow after its app changed adds a new workflow
+    Given The "app1" app has been imported
+    And The "wf1" workflow has been imported with the "app1" app
+    And The "app1" app has been given a new ID
+    When I import the "wf1" workflow with the "app1" app again
+    Then A new workflow is returned
+    And The database has 2 "wf1" workflow records
+
+  Scenario: Re-importing a workflow imported before content hashes adds a new workflow
+    Given The "app1" app has been imported
+    And The "wf1" workflow has been imported with the "app1" app
+    And The "wf1" workflow has no content hash
+    When I import the "wf1" workflow with the "app1" app again
+    Then A new workflow is returned
+    And The database has 2 "wf1" workflow records
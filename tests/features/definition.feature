@@ -0,0 +1,94 @@
+Feature: Definition
+  As a user, I want workflow definitions to be validated and their steps numbered
+
+  Scenario: Steps of a diamond-shaped workflow are numbered by level
+    Given I have a workflow with the following steps
+      | step | depend |
+      | a    |        |
+      | b    | a      |
+      | c    | a      |
+      | d    | b,c    |
+    When I validate the workflow
+    Then I see the following step numbers
+      | step | number | letter |
+      | a    | 1      |        |
+      | b    | 2      | a      |
+      | c    | 2      | b      |
+      | d    | 3      |        |
+
+  Scenario: Parallel steps on the same level are lettered in name order
+    Given I have a workflow with the following steps
+      | step | depend |
+      | s2   |        |
+      | s1   |        |
+      | s3   | s1     |
+      | s4   | s1,s2  |
+      | s5   | s3     |
+      | s6   | s4     |
+    When I validate the workflow
+    Then I see the following step numbers
+      | step | number | letter |
+      | s1   | 1      | a      |
+      | s2   | 1      | b      |
+      | s3   | 2      | a      |
+      | s4   | 2      | b      |
+      | s5   | 3      | a      |
+      | s6   | 3      | b      |
+
+  Scenario: Steps of branches with different lengths are numbered by level
+    Given I have a workflow with the following steps
+      | step | depend |
+      | a    |        |
+      | b    | a      |
+      | c    | b      |
+      | d    | a      |
+      | e    | c,d    |
+    When I validate the workflow
+    Then I see the following step numbers
+      | step | number | letter |
+      | a    | 1      |        |
+      | b    | 2      | a      |
+      | c    | 3      |        |
+      | d    | 2      | b      |
+      | e    | 4      |        |
+
+  Scenario: Workflows with an unknown step dependency are invalid
+    Given I have a workflow with the following steps
+      | step | depend |
+      | a    |        |
+      | b    | x      |
+    When I validate the workflow
+    Then The workflow is invalid
+
+  Scenario: Workflows with a dependency cycle are invalid
+    Given I have a workflow with the following steps
+      | step | depend |
+      | a    |        |
+      | b    | a,c    |
+      | c    | b      |
+    When I validate the workflow
+    Then The workflow is invalid
+
+  Scenario: Adding an identical app definition twice keeps one app
+    Given I have added the "app1" app with the description "first"
+    When I add the "app1" app with the description "first"
+    Then The app is added
+    And The definition has 1 app
+
+  Scenario: Adding a different app definition with the same name fails
+    Given I have added the "app1" app with the description "first"
+    When I add the "app1" app with the description "second"
+    Then The app is not added
+    And The definition has 1 app
+
+  Scenario: Adding an identical workflow definition twice keeps one workflow
+    Given I have added the "wf1" workflow with the description "first"
+    When I add the "wf1" workflow with the description "first"
+    Then The workflow is added
+    And The definition has 1 workflow
+
+  Scenario: Adding a different workflow definition with the same name fails
+    Given I have added the "wf1" workflow with the description "first"
+    When I add the "wf1" workflow with the description "second"
+    Then The workflow is not added
+    And The definition has 1 workflow
@@ -0,0 +1,132 @@
+from geneflow.data import DataSource
+
+
+
+def workflow_def(workflow_name, app_name):
+
+    return {
+        'name': workflow_name,
+        'description': workflow_name,
+        'version': '0.1',
+        'steps': {
+            'step1': {
+                'app_name': app_name,
+                'template': {'output': 'output'}
+            }
+        }
+    }
+
+
+def import_workflow(context, workflow_name, app_name):
+
+    gfdb = DataSource(context.geneflow_config['database'])
+    workflow_ids = gfdb.import_workflows_from_dict(
+        {workflow_name: workflow_def(workflow_name, app_name)}
+    )
+    assert workflow_ids
+    gfdb.commit()
+
+    return workflow_ids[workflow_name]
+
+
+@given('The "{app_name}" app has been imported')
+def step_impl(context, app_name):
+
+    gfdb = DataSource(context.geneflow_config['database'])
+    assert gfdb.import_apps_from_dict({
+        app_name: {
+            'name': app_name,
+            'description': app_name,
+            'definition': {'local': {}}
+        }
+    })
+    gfdb.commit()
+
+
+@given('The "{app_name}" app has been given a new ID')
+def step_impl(context, app_name):
+
+    gfdb = DataSource(context.geneflow_config['database'])
+    app = gfdb.get_app_by_name(app_name)
+    assert app
+    assert gfdb.update_app(app[0]['id'], {'id': '0' * 32})
+    gfdb.commit()
+
+
+@given('The "{workflow_name}" workflow has been imported with the "{app_name}" app')
+def step_impl(context, workflow_name, app_name):
+
+    context.workflow_id = import_workflow(context, workflow_name, app_name)
+
+
+@given('The "{workflow_name}" workflow has no content hash')
+def step_impl(context, workflow_name):
+
+    # workflows imported before content hashes were added
+    gfdb = DataSource(context.geneflow_config['database'])
+    assert gfdb.update_workflow(context.workflow_id, {'content_hash': ''})
+    gfdb.commit()
+
+
+@when('I import the "{workflow_name}" workflow with the "{app_name}" app again')
+def step_impl(context, workflow_name, app_name):
+
+    context.new_workflow_id = import_workflow(context, workflow_name, app_name)
+
+
+@when('I import workflows with the following steps')
+def step_impl(context):
+
+    workflows = {}
+    for row in context.table:
+        workflows[row['workflow']] = workflow_def(
+            row['workflow'], row['app_name']
+        )
+
+    # don't commit, a failed import must leave nothing behind
+    gfdb = DataSource(context.geneflow_config['database'])
+    context.workflow_ids = gfdb.import_workflows_from_dict(workflows)
+    gfdb.close()
+
+
+@then('The workflow import fails')
+def step_impl(context):
+
+    assert context.workflow_ids is False
+
+
+@then('The same workflow is returned')
+def step_impl(context):
+
+    assert context.new_workflow_id == context.workflow_id
+
+
+@then('A new workflow is returned')
+def step_impl(context):
+
+    assert context.new_workflow_id != context.workflow_id
+
+
+@then('The database has {count:d} "{workflow_name}" workflow records')
+def step_impl(context, count, workflow_name):
+
+    gfdb = DataSource(context.geneflow_config['database'])
+    workflows = gfdb.get_workflows()
+    gfdb.close()
+
+    assert workflows is not False
+    assert count == len([
+        workflow for workflow in workflows
+        if workflow['name'] == workflow_name
+    ])
+
+
+@then('The "{workflow_name}" workflow is not in the database')
+def step_impl(context, workflow_name):
+
+    gfdb = DataSource(context.geneflow_config['database'])
+    workflows = gfdb.get_workflows()
+    gfdb.close()
+
+    assert workflows is not False
+    assert workflow_name not in [workflow['name'] for workflow in workflows]
@@ -0,0 +1,137 @@
+from geneflow.definition import Definition
+
+
+
+@given('I have a workflow with the following steps')
+def step_impl(context):
+
+    steps = {}
+    for row in context.table:
+        steps[row['step']] = {
+            'app_name': 'app',
+            'depend': row['depend'].split(',') if row['depend'] else [],
+            'template': {'output': 'output'}
+        }
+
+    context.workflow = {
+        'name': 'workflow',
+        'description': 'workflow',
+        'version': '0.1',
+        'steps': steps
+    }
+
+
+@when('I validate the workflow')
+def step_impl(context):
+
+    context.valid_workflow = Definition.validate_workflow(context.workflow)
+
+
+@then('I see the following step numbers')
+def step_impl(context):
+
+    assert context.valid_workflow
+    steps = context.valid_workflow['steps']
+    assert len(steps) == len(context.table.rows)
+    for row in context.table:
+        assert steps[row['step']]['name'] == row['step']
+        assert steps[row['step']]['number'] == int(row['number'])
+        assert steps[row['step']]['letter'] == row['letter']
+
+
+@then('The workflow is invalid')
+def step_impl(context):
+
+    assert context.valid_workflow is False
+
+
+def app_def(app_name, description):
+
+    return {
+        'name': app_name,
+        'description': description,
+        'definition': {'local': {}}
+    }
+
+
+@given('I have added the "{app_name}" app with the description "{description}"')
+def step_impl(context, app_name, description):
+
+    context.definition = Definition()
+    assert context.definition.add_app(app_def(app_name, description))
+
+
+@when('I add the "{app_name}" app with the description "{description}"')
+def step_impl(context, app_name, description):
+
+    context.app_added = context.definition.add_app(
+        app_def(app_name, description)
+    )
+
+
+@then('The app is added')
+def step_impl(context):
+
+    assert context.app_added is True
+
+
+@then('The app is not added')
+def step_impl(context):
+
+    assert context.app_added is False
+
+
+@then('The definition has {count:d} app')
+def step_impl(context, count):
+
+    assert len(context.definition.apps()) == count
+
+
+def workflow_def(workflow_name, description):
+
+    return {
+        'name': workflow_name,
+        'description': description,
+        'version': '0.1',
+        'steps': {
+            'step1': {
+                'app_name': 'app',
+                'template': {'output': 'output'}
+            }
+        }
+    }
+
+
+@given('I have added the "{workflow_name}" workflow with the description "{description}"')
+def step_impl(context, workflow_name, description):
+
+    context.definition = Definition()
+    assert context.definition.add_workflow(
+        workflow_def(workflow_name, description)
+    )
+
+
+@when('I add the "{workflow_name}" workflow with the description "{description}"')
+def step_impl(context, workflow_name, description):
+
+    context.workflow_added = context.definition.add_workflow(
+        workflow_def(workflow_name, description)
+    )
+
+
+@then('The workflow is added')
+def step_impl(context):
+
+    assert context.workflow_added is True
+
+
+@then('The workflow is not added')
+def step_impl(context):
+
+    assert context.workflow_added is False
+
+
+@then('The definition has {count:d} workflow')
+def step_impl(context, count):
+
+    assert len(context.definition.workflows()) == count
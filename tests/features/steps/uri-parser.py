@@ -23,6 +23,13 @@ def step_impl(context):
         context.uris[uri] = parsed_uri
 
 
+@when('I chop the parsed URI')
+def step_impl(context):
+
+    for uri in context.uris:
+        context.uris[uri] = URIParser.chop(context.uris[uri])
+
+
 @then('I see the following parsed components')
 def step_impl(context):
 
@@ -114,3 +114,68 @@ Feature: URI Parser
       | agave:///                     | local:/      |
       | agave:/                       | local:/      |
  
+  Scenario: Parse agave, relative and bare scheme URIs
+    Given I have a URI
+      | uri                   |
+      | agave:///x            |
+      | agave:///x/           |
+      | agave://storage/path/ |
+      | agave://storage//     |
+      | agave://storage       |
+      | agave:relative/path   |
+      | agave:relative/path/  |
+      | agave:relative        |
+      | agave:                |
+      | local:                |
+      | relative/path         |
+      | relative/path/        |
+      | path//                |
+      | //server/x            |
+    When I parse the URI
+    Then I see the following parsed components
+      | uri                   | chopped_uri          | scheme | authority | path           | chopped_path  | folder        | name     |
+      | agave:///x            | agave:/x             | agave  |           | /x             | /x            | /             | x        |
+      | agave:///x/           | agave:/x             | agave  |           | /x/            | /x            | /x            |          |
+      | agave://storage/path/ | agave://storage/path | agave  | storage   | /path/         | /path         | /path         |          |
+      | agave://storage//     | agave://storage/     | agave  | storage   | /              | /             | /             |          |
+      | agave://storage       | agave://storage/     | agave  | storage   | /              | /             | /             |          |
+      | agave:relative/path   | agave:relative/path  | agave  |           | relative/path  | relative/path | relative      | path     |
+      | agave:relative/path/  | agave:relative/path  | agave  |           | relative/path/ | relative/path | relative/path |          |
+      | agave:relative        | agave:relative       | agave  |           | relative       | relative      |               | relative |
+      | agave:                | agave:/              | agave  |           | /              | /             | /             |          |
+      | local:                | local:/              | local  |           | /              | /             | /             |          |
+      | relative/path         | local:relative/path  | local  |           | relative/path  | relative/path | relative      | path     |
+      | relative/path/        | local:relative/path  | local  |           | relative/path/ | relative/path | relative/path |          |
+      | path//                | local:path           | local  |           | path/          | path          | path          |          |
+      | //server/x            | local://server/x     | local  | server    | /x             | /x            | /             | x        |
+ 
+  Scenario: Chop parsed URIs
+    Given I have a URI
+      | uri                   |
+      | local:/               |
+      | local:///             |
+      | /                     |
+      | agave://storage/      |
+      | agave:/               |
+      | local:/path/to/name/  |
+      | local:/name/          |
+      | agave://storage/path/ |
+      | agave:relative/path/  |
+      | agave:relative/       |
+      | local:/path/to/name   |
+    When I parse the URI
+    And I chop the parsed URI
+    Then I see the following parsed components
+      | uri                   | chopped_uri          | scheme | authority | path          | chopped_path  | folder   | name     |
+      | local:/               | local:/              | local  |           | /             | /             | /        |          |
+      | local:///             | local:/              | local  |           | /             | /             | /        |          |
+      | /                     | local:/              | local  |           | /             | /             | /        |          |
+      | agave://storage/      | agave://storage/     | agave  | storage   | /             | /             | /        |          |
+      | agave:/               | agave:/              | agave  |           | /             | /             | /        |          |
+      | local:/path/to/name/  | local:/path/to/name  | local  |           | /path/to/name | /path/to/name | /path/to | name     |
+      | local:/name/          | local:/name          | local  |           | /name         | /name         | /        | name     |
+      | agave://storage/path/ | agave://storage/path | agave  | storage   | /path         | /path         | /        | path     |
+      | agave:relative/path/  | agave:relative/path  | agave  |           | relative/path | relative/path | relative | path     |
+      | agave:relative/       | agave:relative       | agave  |           | relative      | relative      |          | relative |
+      | local:/path/to/name   | local:/path/to/name  | local  |           | /path/to/name | /path/to/name | /path/to | name     |
+ 